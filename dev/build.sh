@@ -47,6 +47,20 @@ clean() {
     rm -rf ~/.local/share/uv/tools/quick-assistant 2>/dev/null || true
 }
 
+# =============================================================================
+# FUNCTION: manifest
+# =============================================================================
+# Generates the command manifest used to resolve commands without scanning
+# or importing every module under src/domains.
+#
+# PARAMETERS: None
+# RETURNS: None
+# =============================================================================
+manifest() {
+    echo "󰈙 Generating command manifest..."
+    (cd src && uv run python -m common.manifest)
+}
+
 # =============================================================================
 # FUNCTION: build
 # =============================================================================
@@ -75,6 +89,7 @@ build() {
 }
 
 # Main build process
+manifest
 build
 
 echo "󰄬 Build complete! The 'quick' command is now available globally."
@@ -0,0 +1,68 @@
+#!/bin/bash
+
+# =============================================================================
+# Startup Budget Check for Quick Assistant
+# =============================================================================
+#
+# DESCRIPTION:
+#   Measures the cold-start import cost of the `quick` entry point with
+#   `python -X importtime` and fails when it regresses. Building the parser
+#   must not import heavy dependencies; they are loaded lazily once a
+#   command has been selected.
+#
+# FEATURES:
+#   • Sums the self time of every import made while building the parser
+#   • Fails when the total exceeds the budget
+#   • Fails when a heavy dependency is imported at startup
+#
+# REQUIREMENTS:
+#   • uv: Modern Python package manager
+#
+# USAGE:
+#   ./dev/startup.sh
+#   QUICK_STARTUP_BUDGET_MS=80 ./dev/startup.sh
+#
+# =============================================================================
+
+set -e
+
+PROJECT_ROOT="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
+cd "$PROJECT_ROOT/src"
+
+BUDGET_MS="${QUICK_STARTUP_BUDGET_MS:-100}"
+REPORT="$(mktemp)"
+trap 'rm -f "$REPORT"' EXIT
+
+echo "󰔛 Measuring startup imports (budget: ${BUDGET_MS}ms)..."
+
+uv run python -X importtime -c "import app; app.QuickAssistant()" 2> "$REPORT"
+
+uv run python - "$REPORT" "$BUDGET_MS" <<'EOF'
+import sys
+
+report, budget_ms = sys.argv[1], float(sys.argv[2])
+forbidden = ("google.genai", "rich", "questionary", "prompt_toolkit", "pydantic", "dotenv")
+
+total_us = 0
+offenders = set()
+for line in open(report):
+    if not line.startswith("import time:") or "self [us]" in line:
+        continue
+    self_us, _, name = line[len("import time:"):].split("|")
+    total_us += int(self_us)
+    module = name.strip()
+    if any(module == f or module.startswith(f + ".") for f in forbidden):
+        offenders.add(module.split(".")[0] if not module.startswith("google.") else "google.genai")
+
+total_ms = total_us / 1000
+print(f"   Startup imports: {total_ms:.1f}ms")
+
+if offenders:
+    print(f"󰅖 Heavy modules imported at startup: {', '.join(sorted(offenders))}")
+    sys.exit(1)
+if total_ms > budget_ms:
+    print(f"󰅖 Startup imports exceed budget: {total_ms:.1f}ms > {budget_ms:.0f}ms")
+    sys.exit(1)
+EOF
+
+echo "󰄬 Startup within budget!"
@@ -0,0 +1,34 @@
+"""
+Wheel build hook generating the command manifest.
+
+The manifest (`src/commands.manifest.json`) is a build artifact and is not under
+version control, so it is generated here from the sources being packaged and
+force-included at the wheel root, next to the `app`, `common` and `domains`
+packages it describes.
+"""
+
+import sys
+
+from pathlib import Path
+from typing import Any, Dict
+
+from hatchling.builders.hooks.plugin.interface import BuildHookInterface
+
+
+class ManifestBuildHook(BuildHookInterface):
+    """Write the command manifest and add it to the wheel."""
+
+    def initialize(self, version: str, build_data: Dict[str, Any]) -> None:
+        # Editable installs read the manifest from the source tree (see dev/build.sh).
+        if version != "standard":
+            return
+
+        root = Path(self.root) / "src"
+        sys.path.insert(0, str(root))
+        try:
+            from common.manifest import MANIFEST_FILE, build_manifest, write_manifest
+        finally:
+            sys.path.remove(str(root))
+
+        path = write_manifest(build_manifest(root), root)
+        build_data["force_include"][str(path)] = MANIFEST_FILE
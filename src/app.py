@@ -6,38 +6,89 @@ A command-line interface tool for quick text translation using AI.
 """
 
 import sys
-import asyncio
 
-from dotenv import load_dotenv
 from typing import List, Optional
 
 from common.arguments import CommandType, ParsedArgs, QuickCLIConfig, create_parser
-from domains.translate.command.translate import execute_translate
-from domains.commit.command.commit import execute_commit
+from common.command.dispatch import resolve_command
 
 
 class QuickAssistant:
     def __init__(self):
         """Initialize the CLI application."""
-        load_dotenv()
         self.parser = create_parser(QuickCLIConfig.get_config())
 
+    def parse(self, args: Optional[List[str]] = None) -> ParsedArgs:
+        """Parse command-line arguments."""
+        namespace = self.parser.parse_args(args)
+        return ParsedArgs(
+            translate=getattr(namespace, "translate", None),
+            translate_batch=getattr(namespace, "translate_batch", None),
+            translate_document=getattr(namespace, "translate_document", None),
+            import_dictionary=getattr(namespace, "import_dictionary", None),
+            commit=getattr(namespace, "commit", None),
+            daemon=getattr(namespace, "daemon", None),
+            concurrency=getattr(namespace, "concurrency", 8),
+            chunk_tokens=getattr(namespace, "chunk_tokens", 800),
+            stream=getattr(namespace, "stream", False),
+            language=getattr(namespace, "language", "pt"),
+            deep=getattr(namespace, "deep", False),
+            candidates=getattr(namespace, "candidates", 1),
+        )
+
+    async def execute(self, parsed_args: ParsedArgs) -> int:
+        """Execute the selected command, importing its module on demand."""
+        command_type = parsed_args.get_command_type()
+        if command_type is CommandType.HELP:
+            self.parser.print_help()
+            return 1
+
+        execute = resolve_command(command_type)
+
+        match command_type:
+            case CommandType.TRANSLATE:
+                return await execute(
+                    parsed_args.translate, parsed_args.stream, parsed_args.target_language(), parsed_args.deep
+                )
+            case CommandType.TRANSLATE_MULTI:
+                return await execute(
+                    parsed_args.translate, parsed_args.target_languages(), parsed_args.concurrency, parsed_args.deep
+                )
+            case CommandType.TRANSLATE_BATCH:
+                return await execute(parsed_args.translate_batch, parsed_args.concurrency, parsed_args.target_language())
+            case CommandType.TRANSLATE_DOCUMENT:
+                return await execute(
+                    parsed_args.translate_document,
+                    parsed_args.concurrency,
+                    parsed_args.chunk_tokens,
+                    parsed_args.target_language(),
+                )
+            case CommandType.IMPORT_DICTIONARY:
+                return await execute(parsed_args.import_dictionary, parsed_args.target_language())
+            case CommandType.COMMIT:
+                return await execute(parsed_args.commit, parsed_args.candidates)
+            case CommandType.DAEMON:
+                return await execute(parsed_args.daemon)
+
     def run(self, args: Optional[List[str]] = None) -> int:
         """Run the CLI application."""
         try:
-            parsed_args = ParsedArgs(
-                translate=getattr(self.parser.parse_args(args), "translate", None),
-                commit=getattr(self.parser.parse_args(args), "commit", None),
-            )
-
-            match parsed_args.get_command_type():
-                case CommandType.TRANSLATE:
-                    return asyncio.run(execute_translate(parsed_args.translate))
-                case CommandType.COMMIT:
-                    return asyncio.run(execute_commit(parsed_args.commit))
-                case CommandType.HELP:
-                    self.parser.print_help()
-                    return 1
+            parsed_args = self.parse(args)
+            if parsed_args.get_command_type() is CommandType.HELP:
+                self.parser.print_help()
+                return 1
+
+            # Heavy imports are deferred until a command is actually selected.
+            import asyncio
+            from dotenv import load_dotenv
+
+            from common import metrics
+
+            load_dotenv()
+            try:
+                return asyncio.run(self.execute(parsed_args))
+            finally:
+                metrics.report()
 
         except KeyboardInterrupt:
             print("\n\nOperation cancelled by user.")
@@ -49,6 +100,12 @@ class QuickAssistant:
 
 def main() -> int:
     """Main entry point for the application."""
+    from common.daemon.client import forward
+
+    exit_code = forward(sys.argv[1:])
+    if exit_code is not None:
+        return exit_code
+
     app = QuickAssistant()
     return app.run(sys.argv[1:])
 
@@ -7,8 +7,8 @@ and configuring argument parsers for different CLI operations like translation.
 
 import argparse
 
-from typing import Dict, Any, Optional
-from pydantic import BaseModel, ConfigDict
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional
 from enum import Enum
 
 
@@ -21,24 +21,64 @@ class CommandType(Enum):
 
     Attributes:
         TRANSLATE: Translation command for converting text between languages
+        TRANSLATE_MULTI: Translation of one text into several target languages at once
+        TRANSLATE_BATCH: Batch translation of line-delimited or JSONL input
+        TRANSLATE_DOCUMENT: Chunked translation of a long document
+        IMPORT_DICTIONARY: Import of a word list into the offline translation dictionary
         COMMIT: Commit message generation command for git operations
+        DAEMON: Background daemon control command (start, stop, status)
         HELP: Help command displayed when no valid command is provided
     """
     TRANSLATE = "translate"
+    TRANSLATE_MULTI = "translate_multi"
+    TRANSLATE_BATCH = "translate_batch"
+    TRANSLATE_DOCUMENT = "translate_document"
+    IMPORT_DICTIONARY = "import_dictionary"
     COMMIT = "commit"
+    DAEMON = "daemon"
     HELP = "help"
 
-class ParsedArgs(BaseModel):
+@dataclass(frozen=True)
+class ParsedArgs:
     """
     Immutable container for parsed command-line arguments.
 
     Holds the parsed values from CLI arguments and provides methods to determine
-    which command type was specified. Uses Pydantic's frozen model for immutability.
+    which command type was specified. Uses a frozen dataclass rather than a Pydantic
+    model so that parsing arguments does not import Pydantic at startup.
     """
-    model_config = ConfigDict(frozen=True)
-    
+
     translate: Optional[str] = None
+    translate_batch: Optional[str] = None
+    translate_document: Optional[str] = None
+    import_dictionary: Optional[str] = None
     commit: Optional[str] = None
+    daemon: Optional[str] = None
+    concurrency: int = 8
+    chunk_tokens: int = 800
+    stream: bool = False
+    language: str = "pt"
+    deep: bool = False
+    candidates: int = 1
+
+    def target_languages(self) -> List[str]:
+        """
+        Split the comma-separated language option into language codes.
+
+        Returns:
+            Distinct, non-empty language codes in the order given.
+        """
+        return list(dict.fromkeys(code.strip() for code in self.language.split(",") if code.strip()))
+
+    def target_language(self) -> str:
+        """
+        Return the language option for commands that translate into one language.
+
+        Returns:
+            The single code given, without stray commas or spaces; several codes
+            stay comma-separated so that such commands can reject them.
+        """
+        return ",".join(self.target_languages())
 
     def get_command_type(self) -> CommandType:
         """
@@ -48,9 +88,17 @@ class ParsedArgs(BaseModel):
             CommandType: The identified command type, defaults to HELP if none specified.
         """
         if self.translate:
-            return CommandType.TRANSLATE
+            return CommandType.TRANSLATE_MULTI if len(self.target_languages()) > 1 else CommandType.TRANSLATE
+        elif self.translate_batch:
+            return CommandType.TRANSLATE_BATCH
+        elif self.translate_document:
+            return CommandType.TRANSLATE_DOCUMENT
+        elif self.import_dictionary:
+            return CommandType.IMPORT_DICTIONARY
         elif self.commit:
             return CommandType.COMMIT
+        elif self.daemon:
+            return CommandType.DAEMON
         else:
             return CommandType.HELP
 
@@ -78,6 +126,257 @@ class TranslateCLIArguments:
         return {"flag": cls.flag, "help": cls.help}
 
 
+class TranslateBatchCLIArguments:
+    """
+    Configuration class for batch translation CLI arguments.
+
+    Defines the command-line interface configuration for translating every entry
+    of a line-delimited or JSONL file, or of standard input when given "-".
+    """
+
+    flag = "--translate-batch"
+    help = "Translate each line of FILE (plain text or JSONL), or of stdin with '-', writing JSONL results"
+    metavar = "FILE"
+
+    @classmethod
+    def get_config(cls) -> Dict[str, Any]:
+        """
+        Return parser configuration for batch translation arguments.
+
+        Returns:
+            Dictionary containing parser configuration with keys:
+                - flag: Command flag string ("--translate-batch")
+                - help: Help text describing the batch translation command's purpose
+                - metavar: Placeholder shown for the input file in help text
+        """
+        return {"flag": cls.flag, "help": cls.help, "metavar": cls.metavar}
+
+
+class TranslateDocumentCLIArguments:
+    """
+    Configuration class for document translation CLI arguments.
+
+    Defines the command-line interface configuration for translating a long
+    document in chunks, read from a file or from standard input when given "-".
+    """
+
+    flag = "--translate-document"
+    help = "Translate a long document from FILE, or from stdin with '-', in parallel chunks"
+    metavar = "FILE"
+
+    @classmethod
+    def get_config(cls) -> Dict[str, Any]:
+        """
+        Return parser configuration for document translation arguments.
+
+        Returns:
+            Dictionary containing parser configuration with keys:
+                - flag: Command flag string ("--translate-document")
+                - help: Help text describing the document translation command's purpose
+                - metavar: Placeholder shown for the input file in help text
+        """
+        return {"flag": cls.flag, "help": cls.help, "metavar": cls.metavar}
+
+
+class ImportDictionaryCLIArguments:
+    """
+    Configuration class for dictionary import CLI arguments.
+
+    Defines the command-line interface configuration for importing a
+    tab-separated word list into the offline dictionary of the target language.
+    """
+
+    flag = "--import-dictionary"
+    help = "Import a 'term<TAB>translation' word list from FILE, or stdin with '-', into the offline dictionary of -l"
+    metavar = "FILE"
+
+    @classmethod
+    def get_config(cls) -> Dict[str, Any]:
+        """
+        Return parser configuration for dictionary import arguments.
+
+        Returns:
+            Dictionary containing parser configuration with keys:
+                - flag: Command flag string ("--import-dictionary")
+                - help: Help text describing the import command's purpose
+                - metavar: Placeholder shown for the input file in help text
+        """
+        return {"flag": cls.flag, "help": cls.help, "metavar": cls.metavar}
+
+
+class ConcurrencyCLIArguments:
+    """
+    Configuration class for the concurrency option.
+
+    Limits how many model requests commands issue at the same time.
+    """
+
+    flag = "--concurrency"
+    help = "Maximum number of concurrent model requests (default: %(default)s)"
+    metavar = "N"
+    type = int
+    default = 8
+
+    @classmethod
+    def get_config(cls) -> Dict[str, Any]:
+        """
+        Return parser configuration for the concurrency option.
+
+        Returns:
+            Dictionary containing parser configuration with keys:
+                - flag: Option flag string ("--concurrency")
+                - help: Help text describing the option
+                - metavar: Placeholder shown for the value in help text
+                - type: Type the option value is converted to
+                - default: Value used when the option is omitted
+        """
+        return {"flag": cls.flag, "help": cls.help, "metavar": cls.metavar, "type": cls.type, "default": cls.default}
+
+
+class ChunkTokensCLIArguments:
+    """
+    Configuration class for the chunk tokens option.
+
+    Sets the estimated token budget of each chunk in document translation.
+    """
+
+    flag = "--chunk-tokens"
+    help = "Estimated token budget of each document chunk (default: %(default)s)"
+    metavar = "N"
+    type = int
+    default = 800
+
+    @classmethod
+    def get_config(cls) -> Dict[str, Any]:
+        """
+        Return parser configuration for the chunk tokens option.
+
+        Returns:
+            Dictionary containing parser configuration with keys:
+                - flag: Option flag string ("--chunk-tokens")
+                - help: Help text describing the option
+                - metavar: Placeholder shown for the value in help text
+                - type: Type the option value is converted to
+                - default: Value used when the option is omitted
+        """
+        return {"flag": cls.flag, "help": cls.help, "metavar": cls.metavar, "type": cls.type, "default": cls.default}
+
+
+class StreamCLIArguments:
+    """
+    Configuration class for the stream option.
+
+    Renders model output incrementally as tokens arrive instead of after the
+    whole response has been generated.
+    """
+
+    flag = "--stream"
+    help = "Render the translation incrementally as it is generated"
+    action = "store_true"
+
+    @classmethod
+    def get_config(cls) -> Dict[str, Any]:
+        """
+        Return parser configuration for the stream option.
+
+        Returns:
+            Dictionary containing parser configuration with keys:
+                - flag: Option flag string ("--stream")
+                - help: Help text describing the option
+                - action: Argparse action storing True when the flag is given
+        """
+        return {"flag": cls.flag, "help": cls.help, "action": cls.action}
+
+
+class DeepCLIArguments:
+    """
+    Configuration class for the deep option.
+
+    Skips the offline dictionary so that short terms also get the model's full
+    translation with linguistic analysis and examples.
+    """
+
+    flag = "--deep"
+    help = "Always ask the model, even for short terms found in the offline dictionary"
+    action = "store_true"
+
+    @classmethod
+    def get_config(cls) -> Dict[str, Any]:
+        """
+        Return parser configuration for the deep option.
+
+        Returns:
+            Dictionary containing parser configuration with keys:
+                - flag: Option flag string ("--deep")
+                - help: Help text describing the option
+                - action: Argparse action storing True when the flag is given
+        """
+        return {"flag": cls.flag, "help": cls.help, "action": cls.action}
+
+
+class LanguageCLIArguments:
+    """
+    Configuration class for the language option.
+
+    Selects the target language of a translation; a comma-separated list
+    translates the same text into every listed language concurrently.
+    """
+
+    flag = "--language"
+    short_flag = "-l"
+    help = "Target language code, or comma-separated codes such as pt,es,de (default: %(default)s)"
+    metavar = "CODES"
+    default = "pt"
+
+    @classmethod
+    def get_config(cls) -> Dict[str, Any]:
+        """
+        Return parser configuration for the language option.
+
+        Returns:
+            Dictionary containing parser configuration with keys:
+                - flag: Option flag string ("--language")
+                - short_flag: Short option flag string ("-l")
+                - help: Help text describing the option
+                - metavar: Placeholder shown for the value in help text
+                - default: Value used when the option is omitted
+        """
+        return {
+            "flag": cls.flag, "short_flag": cls.short_flag, "help": cls.help,
+            "metavar": cls.metavar, "default": cls.default,
+        }
+
+
+class CandidatesCLIArguments:
+    """
+    Configuration class for the candidates option.
+
+    Generates several commit messages concurrently; the extras are kept ready
+    so that "Regenerate" shows the next one without waiting.
+    """
+
+    flag = "--candidates"
+    help = "Commit messages generated concurrently, extras kept ready for Regenerate (default: %(default)s)"
+    metavar = "K"
+    type = int
+    default = 1
+
+    @classmethod
+    def get_config(cls) -> Dict[str, Any]:
+        """
+        Return parser configuration for the candidates option.
+
+        Returns:
+            Dictionary containing parser configuration with keys:
+                - flag: Option flag string ("--candidates")
+                - help: Help text describing the option
+                - metavar: Placeholder shown for the value in help text
+                - type: Type the option value is converted to
+                - default: Value used when the option is omitted
+        """
+        return {"flag": cls.flag, "help": cls.help, "metavar": cls.metavar, "type": cls.type, "default": cls.default}
+
+
 class CommitCLIArguments:
     """
     Configuration class for commit CLI arguments.
@@ -87,8 +386,8 @@ class CommitCLIArguments:
     """
 
     flag = "--commit"
-    help = "Generate a commit message"
-    choices = ["generate"]
+    help = "Generate a commit message, or watch the index to generate messages ahead of time"
+    choices = ["generate", "watch"]
 
     @classmethod
     def get_config(cls) -> Dict[str, Any]:
@@ -99,7 +398,33 @@ class CommitCLIArguments:
             Dictionary containing parser configuration with keys:
                 - flag: Command flag string ("--commit")
                 - help: Help text describing the commit command's purpose
-                - choices: List of valid subcommands (e.g., ["generate"])
+                - choices: List of valid subcommands ("generate", "watch")
+        """
+        return {"flag": cls.flag, "help": cls.help, "choices": cls.choices}
+
+
+class DaemonCLIArguments:
+    """
+    Configuration class for daemon CLI arguments.
+
+    Defines the command-line interface configuration for controlling the
+    background daemon that keeps the assistant warm between invocations.
+    """
+
+    flag = "--daemon"
+    help = "Control the background daemon that keeps quick warm between calls"
+    choices = ["start", "stop", "status"]
+
+    @classmethod
+    def get_config(cls) -> Dict[str, Any]:
+        """
+        Return parser configuration for daemon arguments.
+
+        Returns:
+            Dictionary containing parser configuration with keys:
+                - flag: Command flag string ("--daemon")
+                - help: Help text describing the daemon command's purpose
+                - choices: List of valid subcommands ("start", "stop", "status")
         """
         return {"flag": cls.flag, "help": cls.help, "choices": cls.choices}
 
@@ -116,8 +441,16 @@ class QuickCLIConfig:
     epilog = (
         "Examples:\n"
         "    quick --translate \"hello world\"\n"
-        "    quick --translate \"bonjour monde\"\n"
-        "    quick --commit generate"
+        "    quick --translate \"bonjour monde\" --stream\n"
+        "    quick --translate \"hello world\" -l pt,es,de,fr\n"
+        "    quick --translate-batch strings.jsonl --concurrency 16\n"
+        "    quick --translate-document README.md > README.pt.md\n"
+        "    quick --import-dictionary en-pt.tsv -l pt\n"
+        "    quick --translate \"apple\" --deep\n"
+        "    quick --commit generate\n"
+        "    quick --commit generate --candidates 3\n"
+        "    quick --commit watch\n"
+        "    quick --daemon start"
     )
 
     @classmethod
@@ -130,8 +463,8 @@ class QuickCLIConfig:
                 - prog: Program name ("quick")
                 - description: CLI tool description text
                 - epilog: Usage examples displayed in help text
-                - commands: List of command configuration dictionaries from
-                           TranslateCLIArguments and CommitCLIArguments
+                - commands: List of mutually exclusive command configuration dictionaries
+                - options: List of option configuration dictionaries that modify commands
         """
         return {
             "prog": "quick",
@@ -139,7 +472,19 @@ class QuickCLIConfig:
             "epilog": cls.epilog,
             "commands": [
                 TranslateCLIArguments.get_config(),
-                CommitCLIArguments.get_config()
+                TranslateBatchCLIArguments.get_config(),
+                TranslateDocumentCLIArguments.get_config(),
+                ImportDictionaryCLIArguments.get_config(),
+                CommitCLIArguments.get_config(),
+                DaemonCLIArguments.get_config()
+            ],
+            "options": [
+                ConcurrencyCLIArguments.get_config(),
+                ChunkTokensCLIArguments.get_config(),
+                StreamCLIArguments.get_config(),
+                LanguageCLIArguments.get_config(),
+                DeepCLIArguments.get_config(),
+                CandidatesCLIArguments.get_config()
             ]
         }
 
@@ -154,7 +499,10 @@ def create_parser(config: Dict[str, Any]) -> argparse.ArgumentParser:
             - prog: Program name (default: "quick")
             - description: Program description
             - epilog: Text to display after help
-            - commands: List of command dictionaries with "flag", "help", and optional "choices" keys
+            - commands: List of command dictionaries with "flag", "help", and optional
+                        "short_flag", "choices", "metavar", "type", "default" and "action" keys
+            - options: List of option dictionaries with the same keys, added outside the
+                       mutually exclusive command group
 
     Returns:
         Configured ArgumentParser instance ready for parsing CLI arguments.
@@ -166,13 +514,19 @@ def create_parser(config: Dict[str, Any]) -> argparse.ArgumentParser:
         epilog=config.get("epilog", "")
     )
 
+    def argument_options(cmd: Dict[str, Any]) -> Dict[str, Any]:
+        return {key: cmd[key] for key in ("help", "choices", "metavar", "type", "default", "action") if key in cmd}
+
+    def flags(cmd: Dict[str, Any]) -> List[str]:
+        return [cmd["short_flag"], cmd["flag"]] if "short_flag" in cmd else [cmd["flag"]]
+
     commands = config.get("commands", [])
     if commands:
         group = parser.add_mutually_exclusive_group()
         for cmd in commands:
-            if "choices" in cmd:
-                group.add_argument(cmd["flag"], help=cmd["help"], choices=cmd["choices"])
-            else:
-                group.add_argument(cmd["flag"], help=cmd["help"])
+            group.add_argument(*flags(cmd), **argument_options(cmd))
+
+    for option in config.get("options", []):
+        parser.add_argument(*flags(option), **argument_options(option))
 
     return parser
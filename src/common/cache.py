@@ -0,0 +1,153 @@
+"""
+Persistent key-value cache backed by SQLite.
+
+Entries are content-addressed text values with a per-entry expiry time. The database
+runs in WAL mode so several `quick` processes can read and write it concurrently;
+writers wait on a busy timeout instead of failing. The cache is bounded by entry
+count and total size, evicting least recently used entries first, and keeps hit
+and miss counters alongside the data.
+"""
+
+import hashlib
+import sqlite3
+import time
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    expires_at REAL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Snapshot of a cache's usage counters and contents."""
+    hits: int
+    misses: int
+    entries: int
+    size: int
+
+
+class SQLiteCache:
+    """
+    Size-bounded LRU cache with per-entry TTL, stored in a SQLite database.
+
+    Args:
+        path: Database file, created if missing
+        max_entries: Maximum number of entries kept after each write
+        max_bytes: Maximum total size of the stored values, in bytes
+        ttl_seconds: Default time to live of new entries, None to never expire
+    """
+
+    def __init__(self, path: Path, max_entries: int, max_bytes: int, ttl_seconds: Optional[float] = None):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(path, timeout=5.0)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+
+    @staticmethod
+    def key(*parts: str) -> str:
+        """Build a content-addressed key from the parts that identify an entry."""
+        digest = hashlib.sha256()
+        for part in parts:
+            encoded = part.encode("utf-8")
+            digest.update(len(encoded).to_bytes(8, "big"))
+            digest.update(encoded)
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Return a cached value and mark it as recently used.
+
+        Args:
+            key: Entry key, usually built with SQLiteCache.key
+
+        Returns:
+            The stored value, or None when missing or expired
+        """
+        now = time.time()
+        row = self._db.execute("SELECT value, expires_at FROM entries WHERE key = ?", (key,)).fetchone()
+
+        if row is None or (row[1] is not None and row[1] <= now):
+            with self._db:
+                if row is not None:
+                    self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._increment("misses")
+            return None
+
+        with self._db:
+            self._db.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+            self._increment("hits")
+        return row[0]
+
+    def put(self, key: str, value: str, ttl_seconds: Optional[float] = None) -> None:
+        """
+        Store a value, evicting least recently used entries beyond the bounds.
+
+        Args:
+            key: Entry key, usually built with SQLiteCache.key
+            value: Text to store
+            ttl_seconds: Time to live of this entry (default: the cache's TTL)
+        """
+        now = time.time()
+        ttl = ttl_seconds if ttl_seconds is not None else self.ttl_seconds
+        expires_at = now + ttl if ttl is not None else None
+
+        with self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, created_at, accessed_at, expires_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, value, len(value.encode("utf-8")), now, now, expires_at),
+            )
+            self._evict(now)
+
+    def stats(self) -> CacheStats:
+        """Return the hit and miss counters and the current number and size of entries."""
+        counters = dict(self._db.execute("SELECT name, value FROM counters").fetchall())
+        entries, size = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        return CacheStats(hits=counters.get("hits", 0), misses=counters.get("misses", 0), entries=entries, size=size)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._db.close()
+
+    def _increment(self, counter: str) -> None:
+        self._db.execute(
+            "INSERT INTO counters (name, value) VALUES (?, 1) ON CONFLICT (name) DO UPDATE SET value = value + 1",
+            (counter,),
+        )
+
+    def _evict(self, now: float) -> None:
+        self._db.execute("DELETE FROM entries WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,))
+        self._db.execute(
+            """
+            DELETE FROM entries WHERE key IN (
+                SELECT key FROM (
+                    SELECT key,
+                           ROW_NUMBER() OVER (ORDER BY accessed_at DESC) AS position,
+                           SUM(size) OVER (ORDER BY accessed_at DESC ROWS UNBOUNDED PRECEDING) AS running_size
+                    FROM entries
+                ) WHERE position > ? OR running_size > ?
+            )
+            """,
+            (self.max_entries, self.max_bytes),
+        )
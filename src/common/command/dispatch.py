@@ -0,0 +1,36 @@
+"""
+Lazy command dispatch for the Quick Assistant CLI.
+
+Resolves each command type to the module and function that executes it using the
+precomputed command manifest. Modules are imported only when their command is
+selected, so `quick --help` and argument errors never pay for loading google-genai,
+rich, questionary or Pydantic.
+"""
+
+import importlib
+
+from typing import Any, Callable, Coroutine
+
+from common.arguments import CommandType
+from common.manifest import load_manifest
+
+
+def resolve_command(command_type: CommandType) -> Callable[..., Coroutine[Any, Any, int]]:
+    """
+    Import the module for a command type and return its entry point.
+
+    Args:
+        command_type: The command selected on the command line
+
+    Returns:
+        The async entry point executing the command
+
+    Raises:
+        ValueError: If no entry point is registered for the command type
+    """
+    entry = load_manifest().commands.get(command_type.value)
+    if entry is None:
+        raise ValueError(f"No entry point registered for command '{command_type.value}'")
+
+    module: Any = importlib.import_module(entry.module)
+    return getattr(module, entry.function)
@@ -6,6 +6,8 @@ It includes validation, error handling, authentication, and retry mechanisms to
 robust command processing with proper HTTP response generation.
 """
 
+import asyncio
+
 from typing import Type, TypeVar, Callable, Awaitable, Optional, Dict, Any, assert_never
 from common.http_response import json_response as json_response, to_response
 from common.json_parser import try_parse_json
@@ -105,19 +107,25 @@ async def execute_command_handler_with_api_key(
     return await execute_command_handler(command_type, request_data, command_handler)
 
 
+R = TypeVar('R')
+
+
 async def retrying_on_failure(
     max_retries: int,
-    action: Callable[[], Awaitable[tuple[Dict[str, Any], int]]]
-) -> tuple[Dict[str, Any], int]:
+    action: Callable[[], Awaitable[R]],
+    backoff_seconds: float = 0.0
+) -> R:
     """
     Retry an action on failure with simple retry logic.
     
     Executes the action up to max_retries times, re-raising the last exception
-    if all attempts fail.
+    if all attempts fail. Waits backoff_seconds after the first failure, doubling
+    the wait after each further failure.
     
     Args:
         max_retries: Maximum number of retry attempts
         action: Async function to retry
+        backoff_seconds: Initial delay between attempts (default: retry immediately)
         
     Returns:
         Successful action result
@@ -135,6 +143,8 @@ async def retrying_on_failure(
         except Exception as err:
             error = err
             retry_count += 1
+            if backoff_seconds and retry_count < max_retries:
+                await asyncio.sleep(backoff_seconds * 2 ** (retry_count - 1))
     
     if error is None:
         raise RuntimeError("Retries exhausted without an error")
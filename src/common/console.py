@@ -5,18 +5,46 @@ Centralizes Console creation to prevent flicker when multiple
 Rich features (status, markdown, progress) render simultaneously.
 """
 
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Generator
+
 from rich.console import Console
 
 _console: Console | None = None
+_bound_console: ContextVar[Console | None] = ContextVar("bound_console", default=None)
 
 def get_console() -> Console:
     """
     Return singleton Console instance.
-    
+
     Returns:
-        Shared Console for all Rich output operations
+        Console bound to the current context, otherwise the shared Console
     """
+    bound = _bound_console.get()
+    if bound is not None:
+        return bound
+
     global _console
     if _console is None:
         _console = Console()
     return _console
+
+@contextmanager
+def bind_console(console: Console) -> Generator[Console, None, None]:
+    """
+    Route all Rich output in the current context to another Console.
+
+    Used by the daemon to render a request on the client's terminal.
+
+    Args:
+        console: Console to return from get_console() inside the block
+
+    Yields:
+        The bound console
+    """
+    token = _bound_console.set(console)
+    try:
+        yield console
+    finally:
+        _bound_console.reset(token)
@@ -0,0 +1,272 @@
+"""
+Explicit context caching of static system instructions.
+
+When enabled, a system instruction is uploaded once as a cached content resource
+and later requests refer to it by name instead of resending it, which lowers input
+token cost and latency. Handles are persisted in the cache directory together with
+their expiry time so they are reused across invocations until they expire. A failed
+creation (e.g. an instruction below the model's minimum cacheable size) is also
+remembered for one TTL, and requests fall back to sending the instruction inline.
+Handles are kept per API key, since a cached content belongs to the project that
+created it. When the server rejects a stored handle (deleted or expired early),
+`generate_content` forgets it and repeats the request with the inline instruction.
+
+Session contexts (`create_context`) additionally hold leading user contents, such
+as a diff, for the length of one interactive session and are deleted by the caller
+when it ends; they are never persisted.
+
+Configuration (environment variables):
+    QUICK_CONTEXT_CACHE             Set to "1" to enable explicit context caching
+    QUICK_CONTEXT_CACHE_TTL         Lifetime of a cached instruction in seconds (default: 3600)
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, Optional
+
+from common.genai_client import get_client
+from common.paths import cache_dir
+
+if TYPE_CHECKING:
+    from google.genai import types
+
+# Handles closer than this to expiry are replaced rather than reused.
+EXPIRY_MARGIN_SECONDS = 60
+
+_locks: Dict[str, asyncio.Lock] = {}
+
+def _handles_path() -> Path:
+    return cache_dir() / "context_caches.json"
+
+
+def _read_handles() -> Dict[str, Dict[str, Any]]:
+    try:
+        with open(_handles_path(), encoding="utf-8") as file:
+            handles = json.load(file)
+        return handles if isinstance(handles, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_handles(handles: Dict[str, Dict[str, Any]]) -> None:
+    path = _handles_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(temporary, "w", encoding="utf-8") as file:
+        json.dump(handles, file)
+    os.replace(temporary, path)
+
+
+async def cached_instruction(api_key: str, model: str, system_instruction: str) -> Optional[str]:
+    """
+    Return the name of a live cached content holding a system instruction.
+
+    Args:
+        api_key: Google API key used to authenticate requests
+        model: Model the cached content is created for
+        system_instruction: Static instruction text to cache
+
+    Returns:
+        Cached content name, or None when caching is disabled or unavailable
+    """
+    if os.getenv("QUICK_CONTEXT_CACHE") != "1":
+        return None
+
+    key = _handle_key(api_key, model, system_instruction)
+    # Concurrent requests of one invocation wait for a single creation.
+    async with _locks.setdefault(key, asyncio.Lock()):
+        return await _cached_instruction(api_key, model, system_instruction, key)
+
+
+def _handle_key(api_key: str, model: str, system_instruction: str) -> str:
+    return hashlib.sha256(f"{api_key}\0{model}\0{system_instruction}".encode()).hexdigest()
+
+
+async def forget_instruction(api_key: str, model: str, system_instruction: str) -> None:
+    """Drop the stored handle of a cached instruction, e.g. after the server rejected it."""
+    key = _handle_key(api_key, model, system_instruction)
+    async with _locks.setdefault(key, asyncio.Lock()):
+        handles = _read_handles()
+        if handles.pop(key, None) is not None:
+            _write_handles(handles)
+
+
+async def _cached_instruction(api_key: str, model: str, system_instruction: str, key: str) -> Optional[str]:
+    from google.genai import types
+
+    now = time.time()
+    handles = {name: handle for name, handle in _read_handles().items() if handle.get("expires", 0) > now}
+    handle = handles.get(key)
+    if handle is not None and handle["expires"] - EXPIRY_MARGIN_SECONDS > now:
+        return handle.get("name")
+
+    ttl = int(os.getenv("QUICK_CONTEXT_CACHE_TTL", "3600"))
+    try:
+        cached = await get_client(api_key).aio.caches.create(
+            model=model,
+            config=types.CreateCachedContentConfig(system_instruction=system_instruction, ttl=f"{ttl}s"),
+        )
+        name = cached.name
+    except Exception:
+        name = None
+
+    handles[key] = {"name": name, "expires": now + ttl}
+    _write_handles(handles)
+    return name
+
+
+async def instruction_config(
+    api_key: str, model: str, system_instruction: str, **config: Any
+) -> "types.GenerateContentConfig":
+    """
+    Build a generation config carrying a static system instruction.
+
+    The instruction is referenced through its cached content when explicit
+    caching is enabled and available, and sent inline otherwise.
+
+    Args:
+        api_key: Google API key used to authenticate requests
+        model: Model the request is sent to
+        system_instruction: Static instruction text
+        **config: Further GenerateContentConfig fields
+
+    Returns:
+        Generation config for the request
+    """
+    from google.genai import types
+
+    cached_content = await cached_instruction(api_key, model, system_instruction)
+    if cached_content:
+        return types.GenerateContentConfig(cached_content=cached_content, **config)
+    return types.GenerateContentConfig(system_instruction=system_instruction, **config)
+
+
+def _is_stale_handle(error: Exception) -> bool:
+    from google.genai import errors
+
+    # A deleted or expired cached content is reported as not found or as permission denied.
+    return isinstance(error, errors.ClientError) and (error.code in (403, 404) or "cache" in str(error).lower())
+
+
+async def generate_content(
+    api_key: str, model: str, system_instruction: str, contents: Any, **config: Any
+) -> "types.GenerateContentResponse":
+    """
+    Send a request with a static system instruction, cached when possible.
+
+    A request rejected because of its cached content is repeated once with the
+    instruction inline, after forgetting the stored handle.
+
+    Args:
+        api_key: Google API key used to authenticate requests
+        model: Model the request is sent to
+        system_instruction: Static instruction text
+        contents: Request contents
+        **config: Further GenerateContentConfig fields
+
+    Returns:
+        The model's response
+    """
+    from google.genai import types
+
+    models = get_client(api_key).aio.models
+    request_config = await instruction_config(api_key, model, system_instruction, **config)
+    try:
+        return await models.generate_content(model=model, contents=contents, config=request_config)
+    except Exception as error:
+        if not request_config.cached_content or not _is_stale_handle(error):
+            raise
+    await forget_instruction(api_key, model, system_instruction)
+    return await models.generate_content(
+        model=model, contents=contents, config=types.GenerateContentConfig(system_instruction=system_instruction, **config)
+    )
+
+
+async def generate_content_stream(
+    api_key: str, model: str, system_instruction: str, contents: Any, **config: Any
+) -> AsyncIterator["types.GenerateContentResponse"]:
+    """
+    Stream a response like `generate_content`, with the same fallback.
+
+    The fallback applies only until the first chunk arrives, so no output is
+    ever repeated.
+
+    Args:
+        api_key: Google API key used to authenticate requests
+        model: Model the request is sent to
+        system_instruction: Static instruction text
+        contents: Request contents
+        **config: Further GenerateContentConfig fields
+
+    Yields:
+        Response chunks
+    """
+    from google.genai import types
+
+    models = get_client(api_key).aio.models
+    request_config = await instruction_config(api_key, model, system_instruction, **config)
+    try:
+        stream = await models.generate_content_stream(model=model, contents=contents, config=request_config)
+        first = await stream.__anext__()
+    except StopAsyncIteration:
+        return
+    except Exception as error:
+        if not request_config.cached_content or not _is_stale_handle(error):
+            raise
+        await forget_instruction(api_key, model, system_instruction)
+        stream = await models.generate_content_stream(
+            model=model, contents=contents, config=types.GenerateContentConfig(system_instruction=system_instruction, **config)
+        )
+        async for chunk in stream:
+            yield chunk
+        return
+
+    yield first
+    async for chunk in stream:
+        yield chunk
+
+
+async def create_context(
+    api_key: str, model: str, system_instruction: str, contents: str, ttl_seconds: int
+) -> Optional[str]:
+    """
+    Cache a system instruction together with fixed leading contents for one session.
+
+    Unlike cached_instruction, the handle is not persisted; delete it with
+    delete_context once the session ends.
+
+    Args:
+        api_key: Google API key used to authenticate requests
+        model: Model the cached content is created for
+        system_instruction: Static instruction text
+        contents: User contents every request of the session starts with
+        ttl_seconds: Lifetime of the cached content if it is never deleted
+
+    Returns:
+        Cached content name, or None when the API rejected the content
+    """
+    from google.genai import types
+
+    try:
+        cached = await get_client(api_key).aio.caches.create(
+            model=model,
+            config=types.CreateCachedContentConfig(
+                system_instruction=system_instruction, contents=[contents], ttl=f"{ttl_seconds}s"
+            ),
+        )
+        return cached.name
+    except Exception:
+        return None
+
+
+async def delete_context(api_key: str, name: str) -> None:
+    """Delete a cached content created with create_context, ignoring failures."""
+    try:
+        await get_client(api_key).aio.caches.delete(name=name)
+    except Exception:
+        pass
@@ -0,0 +1,110 @@
+"""
+Thin client forwarding `quick` invocations to a running daemon.
+
+Only imports the standard library so that forwarding a command costs a socket
+round trip instead of a full cold start. When no daemon is listening, or the
+daemon asks for it, the caller falls back to running the command in-process.
+"""
+
+import os
+import shutil
+import socket
+import sys
+
+from typing import Any, Dict, List, Optional
+
+from common.daemon.protocol import FORWARDED_ENV, decode_frame, encode_frame, socket_path
+
+
+def connect(timeout: Optional[float] = 0.2) -> Optional[socket.socket]:
+    """
+    Open a connection to the daemon socket.
+
+    Args:
+        timeout: Seconds to wait for the connection to be accepted
+
+    Returns:
+        Connected socket, or None when no daemon is listening
+    """
+    path = socket_path()
+    if not path.exists():
+        return None
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(str(path))
+    except OSError:
+        sock.close()
+        return None
+    sock.settimeout(None)
+    return sock
+
+
+def request(frame: Dict[str, Any], timeout: float = 2.0) -> Optional[Dict[str, Any]]:
+    """
+    Send a control frame and return the daemon's single reply.
+
+    Args:
+        frame: Control frame, e.g. {"control": "ping"}
+        timeout: Seconds to wait for the reply
+
+    Returns:
+        The reply frame, or None when no daemon is reachable
+    """
+    sock = connect()
+    if sock is None:
+        return None
+    with sock:
+        sock.settimeout(timeout)
+        try:
+            sock.sendall(encode_frame(frame))
+            line = sock.makefile("rb").readline()
+        except OSError:
+            return None
+    return decode_frame(line) if line else None
+
+
+def forward(argv: List[str]) -> Optional[int]:
+    """
+    Run a command through the daemon, streaming its output to stdout.
+
+    Args:
+        argv: Command-line arguments, without the program name
+
+    Returns:
+        The command's exit code, or None when it must run in-process instead
+    """
+    if os.getenv("QUICK_NO_DAEMON") or "--daemon" in argv:
+        return None
+
+    sock = connect()
+    if sock is None:
+        return None
+
+    with sock:
+        sock.sendall(encode_frame({
+            "argv": argv,
+            "cwd": os.getcwd(),
+            "env": {name: os.environ[name] for name in FORWARDED_ENV if name in os.environ},
+            "width": shutil.get_terminal_size().columns,
+            "color": sys.stdout.isatty(),
+        }))
+
+        try:
+            for line in sock.makefile("rb"):
+                frame = decode_frame(line)
+                if "out" in frame:
+                    sys.stdout.write(frame["out"])
+                    sys.stdout.flush()
+                elif "exit" in frame:
+                    return int(frame["exit"])
+                elif frame.get("fallback"):
+                    return None
+        except KeyboardInterrupt:
+            print("\n\nOperation cancelled by user.")
+            return 1
+
+    # The daemon went away mid-command; its output may be partial.
+    print("Error: Lost connection to the quick daemon")
+    return 1
@@ -0,0 +1,59 @@
+"""
+Wire protocol shared by the Quick Assistant daemon and its thin client.
+
+Messages are JSON objects, one per line, exchanged over a Unix domain socket.
+The client sends a single request frame; the daemon answers with any number of
+output frames followed by a terminating frame.
+
+Request frames:
+    {"argv": [...], "cwd": str, "env": {...}, "width": int, "color": bool}
+    {"control": "ping" | "stop"}
+
+Response frames:
+    {"out": str}              Output to write to the client's stdout
+    {"exit": int}             Command finished with this exit code
+    {"fallback": true}        Command must run in the client's own process
+    {"pid": int, ...}         Reply to a ping
+"""
+
+import json
+import os
+
+from pathlib import Path
+from typing import Any, Dict
+
+from common.paths import runtime_dir
+
+# Environment variables forwarded from the client to the daemon for each request.
+FORWARDED_ENV = ("GOOGLE_API_KEY", "QUICK_METRICS")
+
+
+def socket_path() -> Path:
+    """
+    Return the Unix domain socket the daemon listens on.
+
+    Returns:
+        `$QUICK_DAEMON_SOCKET` if set, otherwise `daemon.sock` in the runtime directory
+    """
+    configured = os.getenv("QUICK_DAEMON_SOCKET")
+    if configured:
+        return Path(configured).expanduser()
+    return runtime_dir() / "daemon.sock"
+
+
+def encode_frame(frame: Dict[str, Any]) -> bytes:
+    """Serialize a frame as a single newline-terminated JSON line."""
+    return (json.dumps(frame, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def decode_frame(line: bytes) -> Dict[str, Any]:
+    """
+    Parse a frame received from the socket.
+
+    Raises:
+        ValueError: If the line is not a JSON object
+    """
+    frame = json.loads(line.decode("utf-8"))
+    if not isinstance(frame, dict):
+        raise ValueError(f"Expected a JSON object frame, got {type(frame).__name__}")
+    return frame
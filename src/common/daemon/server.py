@@ -0,0 +1,175 @@
+"""
+Background daemon keeping the Quick Assistant warm between invocations.
+
+The daemon imports the command modules once, keeps a single `QuickAssistant`
+and event loop alive, and reuses the shared genai clients and their open HTTP
+connections across requests. Clients connect over a Unix domain socket and
+receive the command's output as it is produced.
+
+Requests are served one at a time: a command runs with the client's working
+directory, environment and terminal settings applied to the whole process.
+
+Run with `python -m common.daemon.server`, normally via `quick --daemon start`.
+"""
+
+import asyncio
+import io
+import os
+import sys
+
+from contextlib import redirect_stderr, redirect_stdout
+from typing import IO, Any, Dict, cast
+
+from dotenv import load_dotenv
+from rich.console import Console
+
+from app import QuickAssistant
+from common import metrics
+from common.arguments import CommandType, ParsedArgs
+from common.command.dispatch import resolve_command
+from common.console import bind_console
+from common.daemon.protocol import decode_frame, encode_frame, socket_path
+from common.genai_client import prewarm
+
+# Commands that can run inside the daemon. Interactive commands, such as
+# commit, need the client's terminal for prompts and always run in-process.
+SERVED_COMMANDS = (CommandType.TRANSLATE, CommandType.TRANSLATE_MULTI)
+
+
+class _FrameWriter(io.TextIOBase):
+    """Text stream forwarding everything written to it as output frames."""
+
+    def __init__(self, writer: asyncio.StreamWriter, color: bool):
+        self._writer = writer
+        self._color = color
+
+    def write(self, text: str) -> int:
+        if text and not self._writer.is_closing():
+            self._writer.write(encode_frame({"out": text}))
+        return len(text)
+
+    def isatty(self) -> bool:
+        return self._color
+
+    def writable(self) -> bool:
+        return True
+
+
+class Daemon:
+    """Unix socket server executing forwarded `quick` invocations."""
+
+    def __init__(self):
+        load_dotenv()
+        self.app = QuickAssistant()
+        self.lock = asyncio.Lock()
+        self.served = 0
+        self.stopped = asyncio.Event()
+        for command_type in SERVED_COMMANDS:
+            resolve_command(command_type)
+
+    async def serve(self) -> None:
+        """Listen on the daemon socket until a stop request arrives."""
+        path = socket_path()
+        if path.exists():
+            path.unlink()
+
+        api_key = os.getenv("GOOGLE_API_KEY")
+        if api_key:
+            prewarm(api_key)
+
+        # The socket is created owner-only; a chmod after bind would leave it open in between.
+        umask = os.umask(0o077)
+        try:
+            server = await asyncio.start_unix_server(self._handle_connection, path=str(path))
+        finally:
+            os.umask(umask)
+        try:
+            async with server:
+                await self.stopped.wait()
+        finally:
+            if path.exists():
+                path.unlink()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            line = await reader.readline()
+            if not line:
+                return
+            frame = decode_frame(line)
+
+            match frame.get("control"):
+                case "ping":
+                    writer.write(encode_frame({"pid": os.getpid(), "served": self.served}))
+                case "stop":
+                    writer.write(encode_frame({"exit": 0}))
+                    self.stopped.set()
+                case _:
+                    async with self.lock:
+                        await self._run_command(frame, reader, writer)
+            await writer.drain()
+        except (ConnectionError, ValueError) as error:
+            print(f"Dropped connection: {error}", file=sys.stderr)
+        finally:
+            writer.close()
+
+    async def _run_command(self, frame: Dict[str, Any], reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        output = _FrameWriter(writer, bool(frame.get("color")))
+        console = Console(file=cast(IO[str], output), force_terminal=output.isatty(), width=frame.get("width"))
+
+        with redirect_stdout(output), redirect_stderr(output), bind_console(console):
+            try:
+                parsed_args = self.app.parse(frame.get("argv", []))
+            except SystemExit as exit:
+                writer.write(encode_frame({"exit": exit.code if isinstance(exit.code, int) else 1}))
+                return
+
+            if parsed_args.get_command_type() not in SERVED_COMMANDS:
+                writer.write(encode_frame({"fallback": True}))
+                return
+
+            previous_cwd = os.getcwd()
+            previous_env = {name: os.environ.get(name) for name in frame.get("env", {})}
+            os.chdir(frame.get("cwd", previous_cwd))
+            os.environ.update(frame.get("env", {}))
+            # The report covers this request only, not the daemon's startup (client
+            # creation, prewarm) or whatever ran in the background since the last one.
+            metrics.reset()
+            try:
+                exit_code = await self._execute_until_disconnect(parsed_args, reader)
+                metrics.report()
+            except ConnectionResetError:
+                raise
+            except Exception as e:
+                print(f"Error: {e}")
+                exit_code = 1
+            finally:
+                os.chdir(previous_cwd)
+                for name, value in previous_env.items():
+                    if value is None:
+                        os.environ.pop(name, None)
+                    else:
+                        os.environ[name] = value
+
+        self.served += 1
+        writer.write(encode_frame({"exit": exit_code}))
+
+    async def _execute_until_disconnect(self, parsed_args: ParsedArgs, reader: asyncio.StreamReader) -> int:
+        """Execute a command, cancelling it if the client disconnects first."""
+        command = asyncio.ensure_future(self.app.execute(parsed_args))
+        disconnected = asyncio.ensure_future(reader.read())
+        await asyncio.wait([command, disconnected], return_when=asyncio.FIRST_COMPLETED)
+
+        if not command.done():
+            command.cancel()
+            raise ConnectionResetError("Client disconnected before the command finished")
+        disconnected.cancel()
+        return command.result()
+
+
+def main() -> None:
+    """Run the daemon in the foreground."""
+    asyncio.run(Daemon().serve())
+
+
+if __name__ == "__main__":
+    main()
@@ -3,12 +3,15 @@ Markdown formatting utilities for console output.
 
 This module provides functions for rendering markdown content to the console
 with customizable padding and styling using the Rich library for enhanced
-terminal output formatting.
+terminal output formatting, either at once or incrementally while it streams in.
 """
 
-from typing import List
+from typing import AsyncIterator, List, Optional
+from rich.console import RenderableType
+from rich.live import Live
 from rich.markdown import Markdown
 from rich.padding import Padding
+from rich.spinner import Spinner
 
 from common.console import get_console
 
@@ -34,3 +37,52 @@ class Format:
         padded_content = Padding(markdown, (spacing[0], spacing[1], spacing[2], spacing[3]))
         console.print(padded_content)
 
+    @staticmethod
+    async def markdown_stream(
+        chunks: AsyncIterator[str],
+        spacing: List[int] = [1, 0, 0, 0],
+        waiting_message: Optional[str] = None,
+        min_redraw_chars: int = 80,
+    ) -> str:
+        """
+        Render markdown to the console while it is being received.
+
+        Re-parsing markdown costs time proportional to the whole text, so the view
+        is only rebuilt once at least `min_redraw_chars` new characters, or a line
+        break, have arrived, and the screen is refreshed at most 10 times per second.
+        The final text is always rendered in full.
+
+        Args:
+            chunks: Async iterator of markdown text fragments
+            spacing: Padding in CSS style order [top, right, bottom, left]
+            waiting_message: Spinner text shown until the first fragment arrives
+            min_redraw_chars: Minimum number of new characters between rebuilds
+
+        Returns:
+            The complete markdown text received
+
+        Examples:
+            text = await Format.markdown_stream(
+                (chunk.text async for chunk in stream if chunk.text),
+                waiting_message="Translating…",
+            )
+        """
+        console = get_console()
+        parts: List[str] = []
+        pending = 0
+
+        def render() -> Padding:
+            markdown = Markdown("".join(parts), justify="full")
+            return Padding(markdown, (spacing[0], spacing[1], spacing[2], spacing[3]))
+
+        initial: RenderableType = Spinner("dots", text=waiting_message) if waiting_message else render()
+        with Live(initial, console=console, refresh_per_second=10, vertical_overflow="visible") as live:
+            async for chunk in chunks:
+                parts.append(chunk)
+                pending += len(chunk)
+                if pending >= min_redraw_chars or "\n" in chunk:
+                    live.update(render())
+                    pending = 0
+            live.update(render(), refresh=True)
+
+        return "".join(parts)
@@ -0,0 +1,131 @@
+"""
+Shared google-genai clients for the application.
+
+Creating a `genai.Client` sets up a fresh HTTP client, so every new instance pays
+for its own connection and TLS handshake. Handlers obtain clients from here to
+reuse one instance, and its kept-alive connections, per (API key, endpoint) for
+the life of the process. `prewarm` opens the connection in the background so the
+handshake overlaps with local work such as reading a diff or building a prompt.
+It only sends an unauthenticated HEAD request to the endpoint, which is neither
+billed nor counted against the key's quota.
+
+Configuration (environment variables):
+    QUICK_GENAI_BASE_URL            Alternative API endpoint (default: the public Gemini API)
+    QUICK_GENAI_KEEPALIVE           Seconds an idle connection is kept open (default: 120)
+"""
+
+import asyncio
+import os
+import time
+
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+from common import metrics
+
+if TYPE_CHECKING:
+    from google import genai
+
+_clients: Dict[Tuple[str, Optional[str]], "genai.Client"] = {}
+_warmups: Dict[Tuple[str, Optional[str]], "asyncio.Task[None]"] = {}
+_warmed_at: Dict[Tuple[str, Optional[str]], float] = {}
+
+def _endpoint() -> Optional[str]:
+    return os.getenv("QUICK_GENAI_BASE_URL") or None
+
+
+def _keepalive() -> float:
+    return float(os.getenv("QUICK_GENAI_KEEPALIVE", "120"))
+
+
+def get_client(api_key: str) -> "genai.Client":
+    """
+    Return the process-wide client for an API key and the configured endpoint,
+    creating it on first use.
+
+    Args:
+        api_key: Google API key used to authenticate requests
+
+    Returns:
+        Shared genai.Client instance
+    """
+    key = (api_key, _endpoint())
+    client = _clients.get(key)
+    if client is None:
+        with metrics.timed("genai.client_init_ms"):
+            # Imported here so that cache hits never pay for loading google-genai.
+            import httpx
+            from google import genai
+            from google.genai import types
+
+            client = genai.Client(
+                api_key=api_key,
+                http_options=types.HttpOptions(
+                    base_url=key[1],
+                    async_client_args={"limits": httpx.Limits(keepalive_expiry=_keepalive())},
+                ),
+            )
+        _clients[key] = client
+    return client
+
+
+def prewarm(api_key: str) -> None:
+    """
+    Start connecting to the API in the background, unless already under way or warm.
+
+    Sends an unauthenticated HEAD request to the endpoint through the pooled
+    client, so that DNS resolution, the TLS handshake and client creation are
+    done by the time the first real request is made. A connection warmed less
+    than QUICK_GENAI_KEEPALIVE seconds ago is left as is. Failures are ignored;
+    the real request reports them. Must be called from a running event loop.
+
+    Args:
+        api_key: Google API key used to authenticate requests
+    """
+    key = (api_key, _endpoint())
+    warmup = _warmups.get(key)
+    if warmup is not None and not warmup.done():
+        return
+    if time.monotonic() - _warmed_at.get(key, float("-inf")) < _keepalive():
+        return
+    _warmups[key] = asyncio.get_running_loop().create_task(_warm(api_key, key))
+
+
+async def _warm(api_key: str, key: Tuple[str, Optional[str]]) -> None:
+    try:
+        with metrics.timed("genai.prewarm_ms"):
+            api_client = get_client(api_key)._api_client
+            # The SDK exposes no connection API: reach for its pooled httpx client, and
+            # leave the warmup out when it talks through aiohttp instead.
+            http = getattr(api_client, "_async_httpx_client", None)
+            if http is None or getattr(api_client, "_use_aiohttp", lambda: False)():
+                return
+            await http.head(api_client._http_options.base_url)
+        _warmed_at[key] = time.monotonic()
+    except Exception:
+        pass
+
+
+async def warmed(api_key: str) -> None:
+    """Wait for a pending prewarm of an API key's connection, if any."""
+    warmup = _warmups.get((api_key, _endpoint()))
+    if warmup is not None:
+        await asyncio.shield(warmup)
+
+
+def record_usage(name: str, response: Any) -> None:
+    """
+    Record the token usage reported in a response under `name` metrics.
+
+    Records the prompt, cached prompt and output token counts, so the share of
+    the input served from the context cache can be compared across requests.
+
+    Args:
+        name: Metric name prefix, e.g. "translate"
+        response: GenerateContentResponse or last streamed chunk
+    """
+    usage = getattr(response, "usage_metadata", None)
+    if usage is None:
+        return
+    metrics.record(f"{name}.prompt_tokens", usage.prompt_token_count or 0)
+    metrics.record(f"{name}.cached_tokens", usage.cached_content_token_count or 0)
+    metrics.record(f"{name}.output_tokens", usage.candidates_token_count or 0)
@@ -2,6 +2,7 @@
 # Classes for JSON serialisation and parsing.
 #
 # Use the module-level parse_json and to_json functions for parsing and serialisation
+# Use write_json and write_jsonl to serialise large values straight to a file or socket
 #
 # Inherit from ToJSON to enable serialisation
 # Inherit from FromJSON to enable parsing
@@ -10,9 +11,11 @@
 #
 from __future__ import annotations
 from pydantic import BaseModel, ConfigDict
-from typing import Dict, TypeVar, Type, Self, List, Any, Union, Callable, NewType, Literal, get_args, get_type_hints, get_origin, assert_never
+from typing import Dict, TypeVar, Type, Self, List, Any, Union, Callable, NewType, Literal, Iterable, Iterator, BinaryIO, TextIO, get_args, get_type_hints, get_origin, assert_never
 from decimal import Decimal
+from io import BufferedIOBase, RawIOBase
 from json import dumps
+from socket import socket
 from common.reflection import concrete_type_hints, get_type_constructor, UnboundTypeVar
 from common.result import Result, Ok, Err
 from pydantic import ValidationError
@@ -45,26 +48,51 @@ def parse_json(ty: Type[T], data: JSONObject, opts: ParsingOptions = defaultPars
 def try_parse_json(ty: Type[T], data: JSONObject, opts: ParsingOptions = defaultParsingOptions) -> Result[str, T]:
     return parse(ty, data, opts)
 
+# Encoders by the exact type of the value, resolved on first use from encoder_for.
+_encoders : Dict[type, Callable[[Any], JSONObject]] = {}
+
 def to_json(data: Serializeable) -> JSONObject:
-    if isinstance(data, int) or \
-        isinstance(data, float) or \
-        isinstance(data, str) or \
-        data is None:
-        return data
+    encoder = _encoders.get(data.__class__)
+    if encoder is None:
+        encoder = encoder_for(data.__class__)
+        _encoders[data.__class__] = encoder
+    return encoder(data)
 
-    if isinstance(data, list) or isinstance(data, set):
-        return [to_json(element) for element in data]
+def encode_scalar(data: Any) -> JSONObject:
+    return data
 
-    if isinstance(data, dict):
-        return { key : to_json(value) for key, value in data.items() }
+def encode_sequence(data: Any) -> JSONObject:
+    return [to_json(element) for element in data]
+
+def encode_dict(data: Any) -> JSONObject:
+    return { key : to_json(value) for key, value in data.items() }
+
+def encode_decimal(data: Any) -> JSONObject:
+    return str(data)
+
+def encode_to_json(data: Any) -> JSONObject:
+    return data.to_json()
 
-    if isinstance(data, Decimal):
-        return str(data)
+def encoder_for(ty: type) -> Callable[[Any], JSONObject]:
+    if issubclass(ty, (int, float, str)) or ty is type(None):
+        return encode_scalar
 
-    if isinstance(data, ToJSON):
-        return data.to_json()
+    if issubclass(ty, (list, set)):
+        return encode_sequence
 
-    raise ValueError(f"Cannot convert {type(data).__name__} to JSON")
+    if issubclass(ty, dict):
+        return encode_dict
+
+    if issubclass(ty, Decimal):
+        return encode_decimal
+
+    if issubclass(ty, ToJSON):
+        # Classes that keep the default to_json are encoded by their plan directly.
+        return class_encoder(ty) if ty.to_json is ToJSON.to_json else encode_to_json
+
+    def unsupported(data: Any) -> JSONObject:
+        raise ValueError(f"Cannot convert {type(data).__name__} to JSON")
+    return unsupported
 
 # A type with a direct mapping from JSON string to Python object and back.
 JSONObject = str | float | int | None | list | dict
@@ -72,8 +100,96 @@ JSONObject = str | float | int | None | list | dict
 # Inherit from this class to make the type serializeable
 class ToJSON:
     def to_json(self: Self) -> JSONObject:
-        properties : List[str] = list(get_type_hints(self.__class__).keys())
-        return { prop: to_json(self.__dict__[prop]) for prop in properties }
+        return class_encoder(self.__class__)(self)
+
+# Values of these exact types are their own JSON encoding.
+SCALARS = frozenset({str, int, float, bool, type(None)})
+
+# Serialisation plans by class. A plan is a function generated from the class's
+# fields that reads each field once and returns scalars as they are, so encoding
+# an instance costs about as much as building its dict by hand. A class is planned
+# once; a redefined class is a new class and gets a new plan.
+_class_encoders : Dict[type, Callable[[Any], JSONObject]] = {}
+
+def class_encoder(cls: type) -> Callable[[Any], JSONObject]:
+    encoder = _class_encoders.get(cls)
+    if encoder is not None:
+        return encoder
+
+    fields = list(get_type_hints(cls).keys())
+    lines = ["def encode_fields(instance):", "    values = instance.__dict__"]
+    lines += [f"    _{index} = values[{field!r}]" for index, field in enumerate(fields)]
+    entries = ", ".join(
+        f"{field!r}: _{index} if _{index}.__class__ in scalars else encode(_{index})"
+        for index, field in enumerate(fields)
+    )
+    lines.append(f"    return {{{entries}}}")
+
+    namespace : Dict[str, Any] = {"encode": to_json, "scalars": SCALARS}
+    exec("\n".join(lines), namespace)
+    encoder = namespace["encode_fields"]
+    _class_encoders[cls] = encoder
+    return encoder
+
+# Destinations of the streaming encoder: text or binary streams, or a connected socket.
+Sink = TextIO | BinaryIO | socket
+
+# Bytes of encoded JSON buffered before they are written to the sink.
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Encode a value piece by piece. Dicts, lists, sets and iterators (e.g. generators) are
+# walked element by element; any other value, models included, goes through to_json
+# at once, so at most one element is materialised at a time. The output matches
+# json.dumps(to_json(data), ensure_ascii=False): non-ASCII text is written as is.
+def iter_json(data: Serializeable | Iterable[Any]) -> Iterator[str]:
+    if isinstance(data, dict):
+        yield "{"
+        for position, (key, value) in enumerate(data.items()):
+            name = key if isinstance(key, str) else dumps(key)
+            yield f"{', ' if position else ''}{dumps(name, ensure_ascii=False)}: "
+            yield from iter_json(value)
+        yield "}"
+    elif isinstance(data, (list, set, Iterator)):
+        yield "["
+        for position, element in enumerate(data):
+            if position:
+                yield ", "
+            yield from iter_json(element)
+        yield "]"
+    else:
+        yield dumps(to_json(data), ensure_ascii=False) # type: ignore
+
+def write_json(data: Serializeable | Iterable[Any], sink: Sink, chunk_size: int = STREAM_CHUNK_SIZE) -> None:
+    write_chunks(iter_json(data), sink, chunk_size)
+
+# Write one JSON document per line, pulling the items one at a time.
+def write_jsonl(items: Iterable[Any], sink: Sink, chunk_size: int = STREAM_CHUNK_SIZE) -> None:
+    def lines() -> Iterator[str]:
+        for item in items:
+            yield from iter_json(item)
+            yield "\n"
+    write_chunks(lines(), sink, chunk_size)
+
+def write_chunks(pieces: Iterable[str], sink: Sink, chunk_size: int) -> None:
+    write : Callable[[str], Any]
+    if isinstance(sink, socket):
+        write = lambda text: sink.sendall(text.encode("utf-8"))
+    elif isinstance(sink, (BufferedIOBase, RawIOBase)) or "b" in getattr(sink, "mode", ""):
+        write = lambda text: sink.write(text.encode("utf-8")) # type: ignore
+    else:
+        write = sink.write # type: ignore
+
+    buffered : List[str] = []
+    size = 0
+    for piece in pieces:
+        buffered.append(piece)
+        size += len(piece)
+        if size >= chunk_size:
+            write("".join(buffered))
+            buffered.clear()
+            size = 0
+    if buffered:
+        write("".join(buffered))
 
 def is_optional(typ: Type[Any]) -> bool:
     return get_origin(typ) is Union and type(None) in get_args(typ)
@@ -84,23 +200,38 @@ class FromJSON:
     def from_json(cls: Type[T], json: JSONObject, opts: ParsingOptions = defaultParsingOptions) -> Result[str, T]:
         return parser_for_class(cls)(json, opts)
 
+# Class parsers by class. Field types are resolved on the first parse, so that
+# classes referring to each other (or to themselves) can be compiled in any order.
+_class_parsers: Dict[type, Parser[Any]] = {}
+
 def parser_for_class(cls: Type[T]) -> Parser[T]:
+    cached = _class_parsers.get(cls)
+    if cached is not None:
+        return cached
+
+    compiled_fields : Result[str, List[tuple[str, bool, Parser[Any]]]] | None = None
+
     def class_parser(json: JSONObject, opts: ParsingOptions = defaultParsingOptions) -> Result[str, T]:
+        nonlocal compiled_fields
         if not isinstance(json, dict):
             return Result.err(f"Expected dict but found {type(json).__name__}, when decoding {cls.__name__} from value: {dumps(json)}")
 
-        rhints = try_concrete_type_hints(cls)
-        match rhints.inner:
+        if compiled_fields is None:
+            compiled_fields = try_concrete_type_hints(cls).map(lambda hints: [
+                (field, is_optional(field_type), parser_for(field_type))
+                for field, field_type in hints.items()
+            ])
+        match compiled_fields.inner:
             case Err(error=error):
                 return Result.err(f"When decoding {repr(cls)}\n{error}")
-            case Ok(value=hints):
+            case Ok(value=fields):
                 args : dict[str, Any] = {}
-                for field, field_type in hints.items():
+                for field, optional, field_parser in fields:
                     if field not in json:
-                        if is_optional(field_type) and opts.fill_missing_optionals:
+                        if optional and opts.fill_missing_optionals:
                             args[field] = None
                         continue
-                    parsed = parser_for(field_type)(json[field], opts)
+                    parsed = field_parser(json[field], opts)
                     match parsed.inner:
                         case Ok(value=value):
                             args[field] = value
@@ -118,6 +249,9 @@ def parser_for_class(cls: Type[T]) -> Parser[T]:
                         pretty_loc(details.get("loc")) + ": " + (details.get('msg') or "")
                         for details in e.errors()
                     ]))
+        assert_never(compiled_fields.inner)
+
+    _class_parsers[cls] = class_parser
     return class_parser
 
 def try_concrete_type_hints(ty: Type[T]) -> Result[str, Dict[str, Type]]:
@@ -183,37 +317,71 @@ def parse_None(json: JSONObject, _: ParsingOptions) -> Result[str, None]:
     return Result.err(f"Expected None but found {type(json).__name__}")
 
 def parse_list(json: JSONObject, element_ty: Type[T], opts: ParsingOptions) -> Result[str, list[T]]:
-    if isinstance(json, list):
-        def parseAt(x: tuple[int, JSONObject]) -> Result[str, T]:
-            index, value = x
-            parser = parser_for(element_ty)
-            parsed = parser(value, opts)
-            return parsed.map_err(lambda err: f"At index {str(index)}: {err}")
-
-        return Result.traverse(list(enumerate(json)), parseAt)
-    return Result.err(f"Expected List but found {type(json).__name__}")
+    return parser_for(list[element_ty])(json, opts) # type: ignore
 
 def parse_set(json: JSONObject, element_ty: Type[T], opts: ParsingOptions) -> Result[str, set[T]]:
-    if isinstance(json, list):
-        return parse_list(json, element_ty, opts).map(set)
-    return Result.err(f"Expected Set but found {type(json).__name__}")
+    return parser_for(set[element_ty])(json, opts) # type: ignore
 
 W = TypeVar('W')
 def parse_dict(json: JSONObject, key_ty: Type[T], value_ty: Type[W], opts: ParsingOptions) -> Result[str, dict[T, W]]:
-    if isinstance(json, dict):
-        r = {}
+    return parser_for(dict[key_ty, value_ty])(json, opts) # type: ignore
+
+# Parsers of scalars that accept exactly the instances of a type. Containers of
+# these are checked with isinstance alone, without building a Result per element.
+_instance_parsers : Dict[Parser[Any], type] = {
+    parse_string: str,
+    parse_bool: bool,
+    parse_float: float,
+    parse_int: int,
+}
+
+# Container parsers hold the compiled parsers of their elements, so parsing an
+# element costs one call instead of a parser lookup.
+def list_parser(element_parser: Parser[T]) -> Parser[list[T]]:
+    element_type = _instance_parsers.get(element_parser)
+    def parse_list_of(json: JSONObject, opts: ParsingOptions) -> Result[str, list[T]]:
+        if not isinstance(json, list):
+            return Result.err(f"Expected List but found {type(json).__name__}")
+        if element_type is not None and all(isinstance(value, element_type) for value in json):
+            return Result.ok(list(json))
+        values : list[T] = []
+        for index, value in enumerate(json):
+            parsed = element_parser(value, opts).inner
+            if isinstance(parsed, Err):
+                return Result.err(f"At index {str(index)}: {parsed.error}")
+            values.append(parsed.value)
+        return Result.ok(values)
+    return parse_list_of
+
+def set_parser(element_parser: Parser[T]) -> Parser[set[T]]:
+    parse_elements = list_parser(element_parser)
+    def parse_set_of(json: JSONObject, opts: ParsingOptions) -> Result[str, set[T]]:
+        if not isinstance(json, list):
+            return Result.err(f"Expected Set but found {type(json).__name__}")
+        return parse_elements(json, opts).map(set)
+    return parse_set_of
+
+def dict_parser(key_parser: Parser[T], value_parser: Parser[W]) -> Parser[dict[T, W]]:
+    key_type = _instance_parsers.get(key_parser)
+    value_type = _instance_parsers.get(value_parser)
+    def parse_dict_of(json: JSONObject, opts: ParsingOptions) -> Result[str, dict[T, W]]:
+        if not isinstance(json, dict):
+            return Result.err(f"Expected Dict but found {type(json).__name__}")
+        if key_type is not None and value_type is not None and all(
+            isinstance(key, key_type) and isinstance(value, value_type) for key, value in json.items()
+        ):
+            return Result.ok(dict(json))
+        r : dict[T, W] = {}
         for key, value in json.items():
-            parsed_key = parse(key_ty, key, opts)
-            parsed_val = parse(value_ty, value, opts)
-            match parsed_key.inner:
-                case Err(error=error):
-                    return Result.err(f"Parsing key name {key}: {error}")
-            match parsed_val.inner:
-                case Err(error=error):
-                    return Result.err(f"Parsing key {key}: {error}")
-            r[parsed_key.inner.value] = parsed_val.inner.value
+            parsed_key = key_parser(key, opts).inner
+            if isinstance(parsed_key, Err):
+                return Result.err(f"Parsing key name {key}: {parsed_key.error}")
+            parsed_val = value_parser(value, opts).inner
+            if isinstance(parsed_val, Err):
+                return Result.err(f"Parsing key {key}: {parsed_val.error}")
+            r[parsed_key.value] = parsed_val.value
         return Result.ok(r)
-    return Result.err(f"Expected Dict but found {type(json).__name__}")
+    return parse_dict_of
 
 def parse_decimal(json: JSONObject, opts: ParsingOptions) -> Result[str, Decimal]:
     return parse_string(json, opts).map(Decimal)
@@ -240,7 +408,142 @@ def parse_one_of(json: JSONObject, parsers: List[Parser[T]], opts: ParsingOption
         successes_str = map(lambda x: str(x), successes)
         return Result.err(f"Ambiguous parse of {dumps(json)}: {successes_str}")
 
+# Python types of decoded JSON values.
+JSON_KINDS : tuple[type, ...] = (str, int, float, bool, type(None), list, dict)
+
+# The kind of a JSON value, or None for values of no JSON kind. Subclasses such as
+# OrderedDict count as their base kind; bool is tested before int, which it subclasses.
+def json_kind(json: Any) -> type | None:
+    if json.__class__ in JSON_KINDS:
+        return json.__class__
+    for kind in (dict, list, str, bool, int, float):
+        if isinstance(json, kind):
+            return kind
+    return None
+
+# The kinds of JSON value the parser of a type can accept, or None if it may accept any.
+def json_kinds(ty: Any) -> frozenset[type] | None:
+    if ty is Any:
+        return None
+    if ty is str or ty is Decimal:
+        return frozenset({str})
+    if ty is bool:
+        return frozenset({bool})
+    if ty is float:
+        return frozenset({float})
+    if ty is int:
+        return frozenset({int, bool})
+    if ty is type(None):
+        return frozenset({type(None)})
+    if get_type_constructor(ty) in (list, set):
+        return frozenset({list})
+    if get_type_constructor(ty) is dict:
+        return frozenset({dict})
+    if get_origin(ty) is Union or get_origin(ty) is Literal:
+        members = get_args(ty) if get_origin(ty) is Union else [type(arg) for arg in get_args(ty)]
+        kinds = [json_kinds(member) for member in members]
+        return None if any(k is None for k in kinds) else frozenset().union(*kinds) # type: ignore
+    if isinstance(ty, NewType):
+        return json_kinds(ty.__supertype__)
+    if is_plain_class(ty):
+        return frozenset({dict})
+    return None
+
+# A FromJSON class that did not customise from_json and is therefore decoded from a dict.
+def is_plain_class(ty: Any) -> bool:
+    return isinstance(ty, type) and issubclass(ty, FromJSON) \
+        and getattr(ty.from_json, "__func__", None) is FromJSON.from_json.__func__ # type: ignore
+
+# Find a field declared as a Literal in every class, with different values in each,
+# and map every value to the class declaring it.
+def union_tag(classes: List[type]) -> tuple[str, Dict[Any, type]] | None:
+    hints = []
+    for cls in classes:
+        match try_concrete_type_hints(cls).inner:
+            case Ok(value=class_hints):
+                hints.append(class_hints)
+            case Err():
+                return None
+
+    for field in hints[0]:
+        classes_by_value : Dict[Any, type] = {}
+        for cls, class_hints in zip(classes, hints):
+            field_type = class_hints.get(field)
+            if field_type is None or get_origin(field_type) is not Literal:
+                break
+            values = get_args(field_type)
+            if any(value in classes_by_value for value in values):
+                break
+            classes_by_value.update({value: cls for value in values})
+        else:
+            return field, classes_by_value
+    return None
+
+# Unions are narrowed before any branch is parsed: by the kind of JSON value, and
+# for dicts by the tag field of a tagged union of classes, so usually a single
+# branch is parsed and nested unions cost no more than the branches actually taken.
+def union_parser(args: List[Any]) -> Parser[Any]:
+    branches = [(arg, parser_for(arg), json_kinds(arg)) for arg in args]
+    by_kind = {
+        kind: [parser for _, parser, kinds in branches if kinds is None or kind in kinds]
+        for kind in JSON_KINDS
+    }
+    untyped = [parser for _, parser, kinds in branches if kinds is None]
+    expected = ", ".join(kind.__name__ for kind in JSON_KINDS if by_kind[kind])
+
+    classes = [arg for arg, _, _ in branches if is_plain_class(arg)]
+    tagged : tuple[str, Dict[Any, Parser[Any]], List[Parser[Any]]] | None = None
+    tag_resolved = len(classes) < 2
+
+    def parse_union(json: JSONObject, opts: ParsingOptions) -> Result[str, Any]:
+        nonlocal tagged, tag_resolved
+        kind = json_kind(json)
+        candidates = by_kind[kind] if kind is not None else untyped
+
+        if isinstance(json, dict):
+            # Resolved on first use, once the classes' type hints can be evaluated.
+            if not tag_resolved:
+                tag = union_tag(classes)
+                if tag is not None:
+                    field, classes_by_value = tag
+                    tagged = (
+                        field,
+                        {value: parser_for(cls) for value, cls in classes_by_value.items()},
+                        [parser for arg, parser, _ in branches if parser in by_kind[dict] and arg not in classes],
+                    )
+                tag_resolved = True
+            if tagged is not None and tagged[0] in json:
+                field, parsers_by_value, untagged = tagged
+                try:
+                    selected = parsers_by_value.get(json[field])
+                except TypeError:
+                    selected = None
+                candidates = ([selected] if selected is not None else []) + untagged
+                if not candidates:
+                    return Result.err(f"No parse.\nUnknown {field} {dumps(json[field])}, expected one of: {', '.join(map(repr, parsers_by_value))}")
+
+        if not candidates:
+            return Result.err(f"No parse.\nExpected {expected} but found {type(json).__name__}")
+        return parse_one_of(json, candidates, opts)
+    return parse_union
+
+# Compiled parsers by type. Parsers receive the ParsingOptions on every call,
+# so one compiled parser serves all options.
+_parsers: Dict[Any, Parser[Any]] = {}
+
 def parser_for(ty: Type[T]) -> Parser[T]:
+    try:
+        return _parsers[ty]
+    except KeyError:
+        pass
+    except TypeError:
+        # Types with unhashable arguments are compiled on every call.
+        return compile_parser(ty)
+    parser = compile_parser(ty)
+    _parsers[ty] = parser
+    return parser
+
+def compile_parser(ty: Type[T]) -> Parser[T]:
     if ty is Any:
         return parse_any
     if ty is str:
@@ -255,19 +558,17 @@ def parser_for(ty: Type[T]) -> Parser[T]:
         return parse_None # type: ignore
     if get_type_constructor(ty) is list:
         element_ty, = get_args(ty) or (Any,)
-        return lambda json, opts: parse_list(json, element_ty, opts) # type: ignore
+        return list_parser(parser_for(element_ty)) # type: ignore
     if get_type_constructor(ty) is dict:
         key_ty, value_ty = get_args(ty) or (Any, Any)
-        return lambda json, opts: parse_dict(json, key_ty, value_ty, opts) # type: ignore
+        return dict_parser(parser_for(key_ty), parser_for(value_ty)) # type: ignore
     if get_type_constructor(ty) is set:
         element_ty, = get_args(ty) or (Any,)
-        return lambda json, opts: parse_set(json, element_ty, opts) # type: ignore
+        return set_parser(parser_for(element_ty)) # type: ignore
     if ty is Decimal:
         return parse_decimal # type: ignore
     if get_origin(ty) is Union:
-        args = list(get_args(ty))
-        parsers = [parser_for(arg) for arg in args ]
-        return lambda json, opts: parse_one_of(json, parsers, opts)
+        return union_parser(list(get_args(ty)))
 
     if isinstance(ty, NewType):
         return parser_for(ty.__supertype__) # type: ignore
@@ -0,0 +1,189 @@
+"""
+Precomputed manifest of the CLI commands implemented under `domains`.
+
+Each `domains/<domain>/command/<name>.py` module exposes an `execute_<name>` entry
+point and a `BaseCommandHandler` subclass. Instead of importing every module and
+scanning `__subclasses__()` to find them, the manifest records where each command
+lives, so discovery costs one file read plus a few `stat` calls.
+
+The manifest is generated at build time by parsing the modules' syntax trees,
+without importing them: the wheel build hook (`hatch_build.py`) ships it in the
+wheel, and `dev/build.sh` writes it into the source tree for editable installs.
+It stores the mtime and hash of every scanned file. A missing or stale manifest
+is rebuilt in memory on load; the installed tree is never written to.
+"""
+
+import ast
+import hashlib
+import json
+
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from common.paths import source_root
+
+MANIFEST_VERSION = 2
+MANIFEST_FILE = "commands.manifest.json"
+COMMAND_MODULES_GLOB = "domains/*/command/*.py"
+ENTRY_POINT_PREFIX = "execute_"
+HANDLER_BASE = "BaseCommandHandler"
+
+
+@dataclass(frozen=True)
+class CommandManifestEntry:
+    """Where a command's entry point, handler and command schema are defined."""
+    module: str
+    function: str
+    handler: Optional[str]
+    command: Optional[str]
+
+
+@dataclass(frozen=True)
+class Manifest:
+    """Commands keyed by name, plus the files they were generated from."""
+    commands: Dict[str, CommandManifestEntry]
+    sources: Dict[str, Dict[str, Any]]
+
+
+def _sha256(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def _scan_module(relative: str, tree: ast.Module) -> Optional[CommandManifestEntry]:
+    """Find the entry point and handler class defined in a command module."""
+    function = next((
+        node.name
+        for node in tree.body
+        if isinstance(node, (ast.AsyncFunctionDef, ast.FunctionDef)) and node.name.startswith(ENTRY_POINT_PREFIX)
+    ), None)
+    if function is None:
+        return None
+
+    handler, command = None, None
+    for node in tree.body:
+        if not isinstance(node, ast.ClassDef):
+            continue
+        for base in node.bases:
+            if isinstance(base, ast.Subscript) and isinstance(base.value, ast.Name) and base.value.id == HANDLER_BASE:
+                handler = node.name
+                command = base.slice.id if isinstance(base.slice, ast.Name) else None
+
+    module = relative.removesuffix(".py").replace("/", ".")
+    return CommandManifestEntry(module=module, function=function, handler=handler, command=command)
+
+
+def _command_modules(root: Path) -> List[Path]:
+    return sorted(root.glob(COMMAND_MODULES_GLOB))
+
+
+def build_manifest(root: Optional[Path] = None) -> Manifest:
+    """
+    Generate the manifest by parsing every command module under `domains`.
+
+    Args:
+        root: Source root to scan (default: the installed source root)
+
+    Returns:
+        Freshly generated manifest
+    """
+    root = root or source_root()
+    commands: Dict[str, CommandManifestEntry] = {}
+    sources: Dict[str, Dict[str, Any]] = {}
+
+    for path in _command_modules(root):
+        relative = path.relative_to(root).as_posix()
+        source = path.read_bytes()
+        sources[relative] = {"mtime_ns": path.stat().st_mtime_ns, "sha256": hashlib.sha256(source).hexdigest()}
+
+        entry = _scan_module(relative, ast.parse(source, filename=relative))
+        if entry is not None:
+            commands[entry.function.removeprefix(ENTRY_POINT_PREFIX)] = entry
+
+    return Manifest(commands=commands, sources=sources)
+
+
+def is_stale(manifest: Manifest, root: Optional[Path] = None) -> bool:
+    """
+    Check whether the modules a manifest was generated from have changed.
+
+    Files whose mtime moved are compared by hash, so a touched but unchanged file,
+    or one whose mtime was reset by installation, does not invalidate the manifest.
+
+    Args:
+        manifest: Previously generated manifest
+        root: Source root the manifest describes
+
+    Returns:
+        True when the manifest must be regenerated
+    """
+    root = root or source_root()
+
+    current = [path.relative_to(root).as_posix() for path in _command_modules(root)]
+    if current != sorted(manifest.sources):
+        return True
+
+    for relative, recorded in manifest.sources.items():
+        path = root / relative
+        try:
+            if path.stat().st_mtime_ns == recorded["mtime_ns"]:
+                continue
+            if _sha256(path) != recorded["sha256"]:
+                return True
+        except OSError:
+            return True
+    return False
+
+
+def write_manifest(manifest: Manifest, root: Optional[Path] = None) -> Path:
+    """Write a manifest next to the packages it describes and return its path."""
+    path = (root or source_root()) / MANIFEST_FILE
+    document = {
+        "version": MANIFEST_VERSION,
+        "commands": {name: asdict(entry) for name, entry in manifest.commands.items()},
+        "sources": manifest.sources,
+    }
+    path.write_text(json.dumps(document, indent=2, sort_keys=True) + "\n")
+    return path
+
+
+def read_manifest(root: Optional[Path] = None) -> Optional[Manifest]:
+    """Read the manifest file, returning None when it is missing or unreadable."""
+    path = (root or source_root()) / MANIFEST_FILE
+    try:
+        document = json.loads(path.read_text())
+        if document.get("version") != MANIFEST_VERSION:
+            return None
+        return Manifest(
+            commands={name: CommandManifestEntry(**entry) for name, entry in document["commands"].items()},
+            sources=document["sources"],
+        )
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+_manifest: Manifest | None = None
+
+def load_manifest() -> Manifest:
+    """
+    Return the command manifest, regenerating it in memory if missing or stale.
+
+    The result is memoized for the life of the process.
+
+    Returns:
+        Up-to-date manifest
+    """
+    global _manifest
+    if _manifest is not None:
+        return _manifest
+
+    manifest = read_manifest()
+    if manifest is None or is_stale(manifest):
+        manifest = build_manifest()
+
+    _manifest = manifest
+    return manifest
+
+
+if __name__ == "__main__":
+    print(f"Wrote {write_manifest(build_manifest())}")
@@ -0,0 +1,74 @@
+"""
+Lightweight in-process metrics.
+
+Commands record timings and counters under dotted names (e.g. "genai.prewarm_ms").
+Values are kept in memory for the current invocation and, when QUICK_METRICS=1,
+summarized on stderr once the command finishes.
+
+Configuration (environment variables):
+    QUICK_METRICS                   Set to "1" to report metrics after each command
+"""
+
+import os
+import sys
+import time
+
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, TextIO
+
+_values: Dict[str, List[float]] = {}
+
+def record(name: str, value: float) -> None:
+    """
+    Record one observation of a metric.
+
+    Args:
+        name: Dotted metric name; timings end in "_ms" by convention
+        value: Observed value
+    """
+    _values.setdefault(name, []).append(value)
+
+
+@contextmanager
+def timed(name: str) -> Iterator[None]:
+    """Record the wall time of the enclosed block, in milliseconds, under `name`."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, (time.perf_counter() - started) * 1000)
+
+
+def snapshot() -> Dict[str, List[float]]:
+    """Return a copy of every recorded observation, keyed by metric name."""
+    return {name: list(values) for name, values in _values.items()}
+
+
+def reset() -> None:
+    """Forget every recorded observation."""
+    _values.clear()
+
+
+def enabled() -> bool:
+    """Return whether metrics reporting was requested with QUICK_METRICS=1."""
+    return os.getenv("QUICK_METRICS") == "1"
+
+
+def report(stream: Optional[TextIO] = None) -> None:
+    """
+    Print a summary line per metric when reporting is enabled, then reset.
+
+    Args:
+        stream: Destination of the summary; by default the current sys.stderr,
+            so a redirected stderr (e.g. a daemon client's) receives it
+    """
+    if enabled():
+        stream = stream or sys.stderr
+        for name, values in sorted(_values.items()):
+            total = sum(values)
+            print(
+                f"metric {name}: count={len(values)} total={total:.1f} "
+                f"mean={total / len(values):.1f} max={max(values):.1f}",
+                file=stream,
+            )
+    reset()
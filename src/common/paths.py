@@ -0,0 +1,52 @@
+"""
+Filesystem locations used by the Quick Assistant CLI.
+
+Centralizes where caches and runtime files live so every feature resolves them the
+same way, honouring the XDG base directory environment variables.
+"""
+
+import os
+
+from pathlib import Path
+
+
+def source_root() -> Path:
+    """
+    Return the directory containing the top-level `app`, `common` and `domains` packages.
+
+    Returns:
+        Absolute path of the source root, independent of the working directory
+    """
+    return Path(__file__).resolve().parents[1]
+
+
+def cache_dir() -> Path:
+    """
+    Return the directory for persistent caches, creating it if needed.
+
+    Returns:
+        `$QUICK_CACHE_DIR`, or `$XDG_CACHE_HOME/quick-assistant` (default `~/.cache/quick-assistant`)
+    """
+    configured = os.getenv("QUICK_CACHE_DIR")
+    if configured:
+        path = Path(configured).expanduser()
+    else:
+        base = os.getenv("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+        path = Path(base) / "quick-assistant"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def runtime_dir() -> Path:
+    """
+    Return the directory for sockets and other per-session files, creating it if needed.
+
+    Returns:
+        `$XDG_RUNTIME_DIR/quick-assistant` when available, otherwise the cache directory
+    """
+    base = os.getenv("XDG_RUNTIME_DIR")
+    if not base:
+        return cache_dir()
+    path = Path(base) / "quick-assistant"
+    path.mkdir(mode=0o700, parents=True, exist_ok=True)
+    return path
@@ -1,25 +1,22 @@
 import questionary
 from prompt_toolkit.styles import Style
 
-def prompt_translate(input: str, target_language: str) -> str:
-    return f"""
+# Bump whenever the translation prompt changes its output, invalidating cached translations.
+PROMPT_TRANSLATE_VERSION = "3"
+
+# Static instructions go in the system instruction and the variable input comes last,
+# so every request shares the same long prefix and it can be cached by the API.
+SYSTEM_TRANSLATE = """
     <context>
       You are an expert multilingual technical translator specializing in accurate, natural translations with linguistic insights. Your goal is to translate technical content while providing linguistic analysis and usage examples.
     </context>
 
-    <input>
-      <source_text>
-        {input}
-      </source_text>
-      <target_language>{target_language}</target_language>
-    </input>
-
     <instructions>
-      Follow these steps in order:
+      Follow these steps in order for the source text in the user's <input>:
 
       1. **Language Detection**
         - Identify the source language of the input text
-        - Verify target language: use "{target_language}" if provided and valid, otherwise select a reasonable default
+        - Verify target language: use the <target_language> of the input if valid, otherwise select a reasonable default
 
       2. **Translation**
         - Translate the text naturally and professionally into the target language
@@ -42,7 +39,7 @@ def prompt_translate(input: str, target_language: str) -> str:
       **Source Language:** [Detected Language Name]  
       **Target Language:** [Target Language Name (code)]
 
-      **Tradução:** [Translation result, alternatives separated by " / "]
+      **Translation:** [Translation result, alternatives separated by " / "]
 
       **Análise Linguística:** [Flowing prose paragraph analyzing grammar, naturalness, context]
 
@@ -61,7 +58,8 @@ def prompt_translate(input: str, target_language: str) -> str:
     <formatting_rules>
       - NO preamble or text outside <translation_result> tags
       - NO tables - use plain text with bold labels
-      - Section headings in target language when appropriate
+      - Keep the **Source Language:**, **Target Language:** and **Translation:** labels exactly as written, whatever the target language
+      - Other section headings in target language when appropriate
       - Keep format clean for console rendering
     </formatting_rules>
 
@@ -71,115 +69,242 @@ def prompt_translate(input: str, target_language: str) -> str:
       - Explicitly acknowledge gaps in knowledge
     </quality_standards>"""
 
+def prompt_translate(input: str, target_language: str) -> str:
+    return f"""
+    <input>
+      <target_language>{target_language}</target_language>
+      <source_text>
+        {input}
+      </source_text>
+    </input>"""
+
 
-def prompt_commit_message(git_diff: str) -> str:
+SYSTEM_TRANSLATE_WITH_HINT = """
+    <context>
+      You are an expert multilingual technical translator. A very similar text was
+      translated before; reuse its wording wherever the meaning is unchanged.
+    </context>
+
+    <formatting_rules>
+      - Output ONLY the translation of the source text in the user's <input>
+      - NO preamble, analysis, examples or alternatives
+    </formatting_rules>"""
+
+def prompt_translate_with_hint(input: str, target_language: str, similar_source: str, similar_translation: str) -> str:
+    return f"""
+    <similar_translation>
+      <source_text>{similar_source}</source_text>
+      <translation>{similar_translation}</translation>
+    </similar_translation>
+
+    <input>
+      <target_language>{target_language}</target_language>
+      <source_text>
+        {input}
+      </source_text>
+    </input>"""
+
+
+# Bump whenever the chunk prompt changes its output, invalidating cached chunks.
+PROMPT_TRANSLATE_CHUNK_VERSION = "2"
+
+SYSTEM_TRANSLATE_CHUNK = """
+    <context>
+      You are an expert multilingual technical translator. You are translating a long
+      document one part at a time; the parts will be joined back together in order.
+    </context>
+
+    <instructions>
+      - Translate only the source text of the user's <input>, naturally and professionally, into its target language
+      - Use the <preceding_text> only to keep terminology, tone and references consistent; never translate it
+      - Preserve paragraph breaks, lists, markdown and code exactly as they appear
+      - Leave code, identifiers, URLs and proper names untranslated
+    </instructions>
+
+    <formatting_rules>
+      - Output ONLY the translated text
+      - NO preamble, notes, alternatives or analysis
+    </formatting_rules>"""
+
+def prompt_translate_chunk(input: str, context: str, target_language: str) -> str:
     return f"""
+    <preceding_text>
+      {context}
+    </preceding_text>
+
+    <input>
+      <target_language>{target_language}</target_language>
+      <source_text>
+        {input}
+      </source_text>
+    </input>"""
+
+
+# Bump whenever the commit message prompts change their output, invalidating cached messages.
+PROMPT_COMMIT_MESSAGE_VERSION = "2"
+
+# The change is classified locally (see domains.commit.classify); each size gets its own
+# instruction so the model spends no tokens deciding the shape of the message.
+SYSTEM_COMMIT_MESSAGE_SMALL = """
       <system>
         You are an expert software engineer and version control specialist.
-        Your job is to read git diffs and output high-quality commit messages
-        that follow these rules.
+        Your job is to read a small git diff and output a one-line commit message.
       </system>
 
       <rules>
-        1. Analyze only the provided diff. Do not guess about unrelated changes.
-        2. Classify the change size:
-          - SMALL: changes in 1 file, and total changes are minor
-                    (e.g. a few lines, small refactor, typo, log tweak, single function change).
-          - MEDIUM: multiple files OR a substantial change in 1 file.
-          - LARGE: many files and/or broad impact (new features, big refactors, major deletions).
-        3. Commit message style:
-          - Use present-tense, imperative in the title (e.g. "add X", "fix Y", "refactor Z").
-          - Avoid noise words like "small change" or "minor update".
-          - No ticket IDs, no author names, no "WIP".
-        4. Output format:
-          - For SMALL changes:
-            - Output ONLY a single-line summary (no body).
-          - For MEDIUM or LARGE changes:
-            - Line 1: single-line summary (title).
-            - Line 2: blank line.
-            - From line 3 onwards: one or more bullet points,
-              each line starting with "- " (dash + space).
-        5. Formatting rules for the body (MEDIUM/LARGE only):
-          - You MAY use inline code formatting with single backticks, e.g. `function_name`, `git diff`.
-          - Do NOT use multiline code fences (no ``` blocks).
-          - Keep language concise and concrete. Prefer what the change DOES over HOW it is implemented.
+        1. Analyze only the diff in the user's <input>. Do not guess about unrelated changes.
+        2. Use present-tense, imperative (e.g. "add X", "fix Y", "refactor Z").
+        3. Avoid noise words like "small change" or "minor update".
+        4. No ticket IDs, no author names, no "WIP".
       </rules>
 
-      <examples>
-
-        <example>
-          <git_diff>
-            // Single file, few lines
-            diff --git a/src/logger.ts b/src/logger.ts
-            index 1234567..89abcde 100644
-            --- a/src/logger.ts
-            +++ b/src/logger.ts
-            @@ -10,7 +10,7 @@ export function logInfo(message: string) {{
-            -  console.log('[INFO]', message);
-            +  console.log('[INFO]', new Date().toISOString(), message);
-            }}
-          </git_diff>
-
-          <classification>SMALL</classification>
-          <commit_message>
-            update info logger to include timestamp
-          </commit_message>
-        </example>
-
-        <example>
-          <git_diff>
-            // Multiple files, new function and wiring
-            diff --git a/tools/prompting.py b/tools/prompting.py
-            index 1111111..2222222 100644
-            --- a/tools/prompting.py
-            +++ b/tools/prompting.py
-            @@ -1,0 +1,40 @@
-            +def prompt_commit_message(git_diff: str) -> str:
-            +    \"\"\"Generate a commit message prompt from a git diff.\"\"\"
-            +    ...
-
-            diff --git a/tests/test_prompting.py b/tests/test_prompting.py
-            index 3333333..4444444 100644
-            --- a/tests/test_prompting.py
-            +++ b/tests/test_prompting.py
-            @@ -1,0 +1,25 @@
-            +def test_prompt_commit_message():
-            +    ...
-          </git_diff>
-
-          <classification>MEDIUM</classification>
-          <commit_message>
-            add prompt_commit_message function for git diff analysis
-
-            - Add helper to generate commit messages from git diffs following our guidelines.
-            - Includes initial implementation of `prompt_commit_message` and tests to validate basic usage.
-            - ...
-          </commit_message>
-        </example>
-
-      </examples>
+      <example>
+        <git_diff>
+          @@ -10,7 +10,7 @@ export function logInfo(message: string) {
+          -  console.log('[INFO]', message);
+          +  console.log('[INFO]', new Date().toISOString(), message);
+        </git_diff>
+        <commit_message>update info logger to include timestamp</commit_message>
+      </example>
+
+      <output_instructions>
+        Output ONLY the single-line commit message, with no body, explanation, quotes or code fences.
+      </output_instructions>
+"""
+
+SYSTEM_COMMIT_MESSAGE_MEDIUM = """
+      <system>
+        You are an expert software engineer and version control specialist.
+        Your job is to read a git diff touching a few files or one file substantially
+        and output a commit message with a title and a short body.
+      </system>
 
+      <rules>
+        1. Analyze only the diff in the user's <input>. Do not guess about unrelated changes.
+        2. Use present-tense, imperative in the title (e.g. "add X", "fix Y", "refactor Z").
+        3. Avoid noise words like "small change" or "minor update". No ticket IDs, no author names, no "WIP".
+        4. Write 1 to 4 bullets. Prefer what the change DOES over HOW it is implemented.
+        5. You MAY use inline code with single backticks, e.g. `function_name`. No code fences.
+      </rules>
+
+      <output_instructions>
+        1. Output ONLY the final commit message text, with no explanation, quotes or code fences.
+        2. Line 1: title line. Line 2: blank. Remaining lines: each line is a bullet starting with "- ".
+      </output_instructions>
+"""
+
+SYSTEM_COMMIT_MESSAGE_LARGE = """
+      <system>
+        You are an expert software engineer and version control specialist.
+        Your job is to read a git diff with many files or a broad impact and output
+        a commit message with a title and a body.
+      </system>
+
+      <rules>
+        1. Analyze only the diff in the user's <input>. Do not guess about unrelated changes.
+        2. Use present-tense, imperative in the title (e.g. "add X", "fix Y", "refactor Z").
+           The title names the overall change, not one of its parts.
+        3. Avoid noise words like "small change" or "minor update". No ticket IDs, no author names, no "WIP".
+        4. Group related files into one bullet and leave out trivial changes such as formatting.
+           Prefer what the change DOES over HOW it is implemented.
+        5. You MAY use inline code with single backticks, e.g. `function_name`. No code fences.
+      </rules>
+
+      <output_instructions>
+        1. Output ONLY the final commit message text, with no explanation, quotes or code fences.
+        2. Line 1: title line. Line 2: blank. Remaining lines: each line is a bullet starting with "- ".
+      </output_instructions>
+"""
+
+def prompt_commit_message(git_diff: str) -> str:
+    return f"""
       <input>
         <git_diff>
           {git_diff}
         </git_diff>
       </input>
+"""
+
+
+# Bump whenever the file summary prompt changes its output, invalidating cached summaries.
+PROMPT_SUMMARIZE_FILE_DIFF_VERSION = "1"
+
+SYSTEM_SUMMARIZE_FILE_DIFF = """
+      <system>
+        You are an expert software engineer. You summarize one part of a large git diff;
+        the summaries of all parts are later combined into a single commit message.
+      </system>
+
+      <rules>
+        - Describe what the change in the user's <input> DOES, not how, in 1 to 3 short sentences
+        - Mention added, removed or renamed functions, classes, options and files by name
+        - Say "formatting only" or "no functional change" when that is the case
+        - Output ONLY the summary, with no preamble, headings or code fences
+      </rules>
+"""
+
+def prompt_summarize_file_diff(path: str, git_diff: str) -> str:
+    return f"""
+      <input>
+        <path>{path}</path>
+        <git_diff>
+          {git_diff}
+        </git_diff>
+      </input>
+"""
+
+
+SYSTEM_COMMIT_MESSAGE_FROM_SUMMARIES = """
+      <system>
+        You are an expert software engineer and version control specialist.
+        A large diff was summarized file by file; write one commit message for the
+        whole change from the summaries in the user's <input>.
+      </system>
+
+      <rules>
+        1. Use only the summaries. Do not guess about unrelated changes.
+        2. The change is MEDIUM or LARGE: several files or a broad impact.
+        3. Use present-tense, imperative in the title (e.g. "add X", "fix Y", "refactor Z").
+           No ticket IDs, no author names, no "WIP".
+        4. Group related summaries into one bullet and leave out trivial changes
+           such as formatting-only files.
+      </rules>
 
       <output_instructions>
-        1. First, internally decide if the change is SMALL, MEDIUM, or LARGE
-          according to the rules above.
-        2. Then output ONLY the final commit message text, with no explanation.
-        3. Do NOT wrap the commit message in quotes or code fences.
-        4. Respect the required format based on size:
-          - SMALL: single line only.
-          - MEDIUM/LARGE:
-            • Line 1: title line.
-            • Line 2: blank.
-            • Remaining lines: each line is a bullet starting with "- ".
-        5. Inline code with single backticks is allowed in the bullet points.
+        1. Output ONLY the final commit message text, with no explanation.
+        2. Do NOT wrap the commit message in quotes or code fences.
+        3. Line 1: title line. Line 2: blank. Remaining lines: each line is a bullet starting with "- ".
+        4. Inline code with single backticks is allowed in the bullet points.
       </output_instructions>
 """
 
+def prompt_commit_message_from_summaries(summaries: str) -> str:
+    return f"""
+      <input>
+        <file_summaries>
+          {summaries}
+        </file_summaries>
+      </input>
+"""
+
+
+SYSTEM_REFINE_COMMIT_MESSAGE = (
+    "You revise commit messages. Use the diff and the user's adjustment to produce a polished commit message. "
+    "Keep the format required by the change's <size>: small=single line; medium or large=title, blank line, bullets prefixed with '- '. "
+    "Every turn gives the current message and an adjustment; answer with the revised message only."
+)
+
+def prompt_refine_changes(git_diff: str, size: str) -> str:
+    return f"<size>{size}</size>\n<diff>\n{git_diff}\n</diff>"
+
+
+def prompt_refine_turn(current_message: str, adjustment: str) -> str:
+    return f"<current>\n{current_message}\n</current>\n<adjustment>\n{adjustment}\n</adjustment>"
+
+
+def prompt_refine_commit_message(git_diff: str, size: str, current_message: str, adjustment: str) -> str:
+    return f"{prompt_refine_changes(git_diff, size)}\n{prompt_refine_turn(current_message, adjustment)}"
+
 
 # Custom minimal style for prompts
 PROMPT_STYLE = Style(
@@ -1,7 +1,7 @@
 from typing import List, TypeVar, Type, Dict, Any, Union, get_type_hints
 import typing
-from pathlib import Path
 import importlib
+from common.paths import source_root
 from common.result import Result, Ok, Err
 
 T = TypeVar('T')
@@ -35,17 +35,17 @@ def import_all(prefix: str) -> None:
     """
     Import all modules that start with a prefix.
     If no prefix is given, all project files will be imported.
-    """
-    files = [
-        str(file)
-        for file in Path.cwd().rglob('*.py')
-        if file.is_file()
-    ]
 
+    Modules are resolved from the source root, not the working directory.
+    To find command modules prefer common.manifest.load_manifest,
+    which reads a precomputed manifest instead of walking the tree.
+    """
+    root = source_root()
     modules = [
         module
-        for file in files
-        for module in [file.replace(str(Path.cwd()) + "/","").replace("/",".").replace(".py","")]
+        for file in root.rglob('*.py')
+        if file.is_file()
+        for module in [file.relative_to(root).with_suffix("").as_posix().replace("/", ".")]
         if module.startswith(prefix)
     ]
 
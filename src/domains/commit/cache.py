@@ -0,0 +1,119 @@
+"""
+Caches of generated commit messages and file summaries, kept inside each repository.
+
+Messages are keyed by the id of the staged tree (`git write-tree`), the model,
+the prompt version and the diff preprocessing settings, so re-running the commit
+command on an unchanged index shows the last message without a model round trip.
+
+The file summaries of large diffs are keyed by the (old blob, new blob) pair of
+each file (`git diff --raw`), so when a commit is built up incrementally only the
+files whose staged content changed since the last run are summarized again.
+
+The databases live under the repository's git directory and therefore never
+serve entries across repositories.
+
+Configuration (environment variables):
+    QUICK_COMMIT_CACHE              Set to "0" to disable both caches
+    QUICK_COMMIT_CACHE_MAX_ENTRIES  Maximum number of cached messages per repository (default: 200)
+    QUICK_COMMIT_SUMMARY_MAX_ENTRIES Maximum number of cached file summaries per repository (default: 5000)
+"""
+
+import os
+
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from common.cache import SQLiteCache
+from common.prompts import PROMPT_COMMIT_MESSAGE_VERSION, PROMPT_SUMMARIZE_FILE_DIFF_VERSION
+from domains.commit.preprocess import PreprocessOptions
+
+# Messages of a staged tree are rarely useful after a month.
+TTL_SECONDS = 30 * 24 * 3600
+MAX_BYTES = 4 * 1024 * 1024
+
+_caches: Dict[Path, SQLiteCache] = {}
+
+def _open(path: Path, max_entries: int) -> SQLiteCache:
+    cache = _caches.get(path)
+    if cache is None:
+        cache = SQLiteCache(path, max_entries=max_entries, max_bytes=MAX_BYTES, ttl_seconds=TTL_SECONDS)
+        _caches[path] = cache
+    return cache
+
+
+def commit_cache(git_dir: Path) -> Optional[SQLiteCache]:
+    """
+    Return the commit message cache of a repository, opening it on first use.
+
+    Args:
+        git_dir: Absolute path of the repository's git directory
+
+    Returns:
+        The repository's cache, or None when disabled with QUICK_COMMIT_CACHE=0
+    """
+    if os.getenv("QUICK_COMMIT_CACHE", "1") == "0":
+        return None
+    return _open(
+        git_dir / "quick-assistant" / "commit_messages.sqlite3",
+        int(os.getenv("QUICK_COMMIT_CACHE_MAX_ENTRIES", "200")),
+    )
+
+
+def summary_cache(git_dir: Path) -> Optional[SQLiteCache]:
+    """
+    Return the file summary cache of a repository, opening it on first use.
+
+    Args:
+        git_dir: Absolute path of the repository's git directory
+
+    Returns:
+        The repository's cache, or None when disabled with QUICK_COMMIT_CACHE=0
+    """
+    if os.getenv("QUICK_COMMIT_CACHE", "1") == "0":
+        return None
+    return _open(
+        git_dir / "quick-assistant" / "file_summaries.sqlite3",
+        int(os.getenv("QUICK_COMMIT_SUMMARY_MAX_ENTRIES", "5000")),
+    )
+
+
+def commit_message_key(tree: str, head_tree: str, model: str, options: PreprocessOptions, context_lines: int) -> str:
+    """
+    Build the cache key of the message generated for a staged tree.
+
+    The message describes the staged tree against HEAD, so both trees are part
+    of the key: after a commit the index writes the same tree against a new HEAD.
+
+    Args:
+        tree: Object id printed by `git write-tree`
+        head_tree: Tree id of HEAD, or "" before the first commit
+        model: Model generating the message
+        options: Preprocessing applied to the diff the model saw
+        context_lines: Context lines requested from `git diff`
+
+    Returns:
+        Cache key string
+    """
+    return SQLiteCache.key(tree, head_tree, model, PROMPT_COMMIT_MESSAGE_VERSION, repr(options), str(context_lines))
+
+
+def file_summary_key(
+    path: str, blobs: Tuple[str, str], part: int, model: str, options: PreprocessOptions, context_lines: int
+) -> str:
+    """
+    Build the cache key of the summary of one piece of a file's diff.
+
+    Args:
+        path: Path of the file after the change
+        blobs: Old and new blob ids of the file, as printed by `git diff --raw`
+        part: Index of the piece among the hunk groups of the file
+        model: Model writing the summary
+        options: Preprocessing applied to the diff the model saw
+        context_lines: Context lines requested from `git diff`
+
+    Returns:
+        Cache key string
+    """
+    return SQLiteCache.key(
+        path, *blobs, str(part), model, PROMPT_SUMMARIZE_FILE_DIFF_VERSION, repr(options), str(context_lines)
+    )
@@ -0,0 +1,61 @@
+"""
+Commit message candidates generated ahead of the user.
+
+The pool hands out one candidate at a time while keeping a number of spare
+generations running in the background, so "Regenerate" can swap in a message
+that is already finished instead of waiting for a new request.
+"""
+
+import asyncio
+
+from collections import deque
+from typing import Awaitable, Callable, Deque
+
+
+class CandidatePool:
+    """
+    Buffer of concurrently generated commit messages.
+
+    Args:
+        generate: Starts the generation of one candidate
+        spares: Number of generations kept running beyond the candidate in use
+    """
+
+    def __init__(self, generate: Callable[[], Awaitable[str]], spares: int):
+        self._generate = generate
+        self._spares = max(0, spares)
+        self._pending: Deque["asyncio.Future[str]"] = deque()
+
+    def fill(self) -> None:
+        """Start generations until the configured number of spares is running."""
+        while len(self._pending) < self._spares:
+            self._pending.append(asyncio.ensure_future(self._generate()))
+
+    def ready(self) -> bool:
+        """Return whether a candidate can be handed out without waiting."""
+        return any(task.done() for task in self._pending)
+
+    async def next(self) -> str:
+        """
+        Return the next candidate, preferring one that has already finished.
+
+        A replacement generation is started right away to keep the buffer full.
+
+        Raises:
+            Exception: The error of the generation handed out, if it failed
+        """
+        task = next((task for task in self._pending if task.done()), None)
+        if task is not None:
+            self._pending.remove(task)
+        elif self._pending:
+            task = self._pending.popleft()
+        else:
+            task = asyncio.ensure_future(self._generate())
+        self.fill()
+        return await task
+
+    def close(self) -> None:
+        """Cancel every generation still buffered or running."""
+        for task in self._pending:
+            task.cancel()
+        self._pending.clear()
@@ -0,0 +1,112 @@
+"""
+Local classification of a staged change by size.
+
+The commit prompt used to ask the model to decide whether a change is SMALL,
+MEDIUM or LARGE before writing the message. The same decision is made here from
+the numstat of the staged diff (files changed, lines added and removed, and the
+top-level directories touched), so the model gets a prompt written for that size
+only and SMALL changes can be sent to a lighter model.
+
+Configuration (environment variables):
+    QUICK_COMMIT_SMALL_LINES        Most changed lines of a single-file SMALL change (default: 30)
+    QUICK_COMMIT_LARGE_FILES        Files changed from which a change is LARGE (default: 10)
+    QUICK_COMMIT_LARGE_LINES        Changed lines from which a change is LARGE (default: 500)
+    QUICK_COMMIT_SMALL_MODEL        Model used for SMALL changes (default: the commit model)
+"""
+
+import os
+
+from dataclasses import dataclass
+from enum import Enum
+from typing import Tuple
+
+from domains.commit.diff import split_files
+from domains.commit.preprocess import is_excluded, numstat
+
+# Changes spreading over this many top-level directories have a broad impact.
+LARGE_AREAS = 4
+
+
+class ChangeSize(Enum):
+    """Size class of a staged change, deciding the shape of its commit message."""
+    SMALL = "small"
+    MEDIUM = "medium"
+    LARGE = "large"
+
+
+@dataclass(frozen=True)
+class DiffStats:
+    """Numstat totals of a diff."""
+    files: int
+    added: int
+    removed: int
+    paths: Tuple[str, ...]
+
+    @property
+    def lines(self) -> int:
+        """Number of added and removed lines."""
+        return self.added + self.removed
+
+    @property
+    def areas(self) -> int:
+        """Number of distinct top-level directories touched; root files count as one."""
+        return len({path.split("/", 1)[0] if "/" in path else "" for path in self.paths})
+
+
+def diff_stats(diff: str, exclude: Tuple[str, ...] = ()) -> DiffStats:
+    """
+    Compute the numstat totals of a diff, as `git diff --numstat` would.
+
+    Args:
+        diff: Output of `git diff --staged`
+        exclude: Globs of paths left out of the totals, e.g. lockfiles, whose
+            changes say nothing about the size of the change itself
+
+    Returns:
+        Number of files, added and removed lines, and the changed paths
+    """
+    files = [file_diff for file_diff in split_files(diff) if not is_excluded(file_diff.path, exclude)]
+    added = removed = 0
+    for file_diff in files:
+        file_added, file_removed = numstat(file_diff.text)
+        added += file_added
+        removed += file_removed
+    return DiffStats(files=len(files), added=added, removed=removed, paths=tuple(f.path for f in files))
+
+
+def classify_change(stats: DiffStats) -> ChangeSize:
+    """
+    Classify a change by the numstat of its diff.
+
+    Args:
+        stats: Numstat totals of the staged diff
+
+    Returns:
+        SMALL for a few lines in one file, LARGE for many files, many lines or a
+        change spread over several areas, MEDIUM otherwise
+    """
+    if stats.files <= 1 and stats.lines <= int(os.getenv("QUICK_COMMIT_SMALL_LINES", "30")):
+        return ChangeSize.SMALL
+    if (
+        stats.files >= int(os.getenv("QUICK_COMMIT_LARGE_FILES", "10"))
+        or stats.lines >= int(os.getenv("QUICK_COMMIT_LARGE_LINES", "500"))
+        or stats.areas >= LARGE_AREAS
+    ):
+        return ChangeSize.LARGE
+    return ChangeSize.MEDIUM
+
+
+def model_for(size: ChangeSize, default: str) -> str:
+    """
+    Return the model that writes the message of a change of the given size.
+
+    Args:
+        size: Size class of the change
+        default: Model used unless QUICK_COMMIT_SMALL_MODEL applies
+
+    Returns:
+        QUICK_COMMIT_SMALL_MODEL for SMALL changes when set, otherwise `default`
+    """
+    if size is ChangeSize.SMALL:
+        return os.getenv("QUICK_COMMIT_SMALL_MODEL") or default
+    return default
@@ -1,22 +1,61 @@
+import asyncio
 import os
-import subprocess
-import tempfile
 
-from typing import Any, Dict, Optional
-from google import genai
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
 from google.genai import types
+from common import metrics
 from common.base import BaseFrozen, ToJSON
+from common.cache import SQLiteCache
 from common.command.base_command import BaseCommand
 from common.command.base_command_handler import BaseCommandHandler
 from common.command.execute_command_handler import BadRequest, json_response, execute_command_handler
+from common.context_cache import generate_content
+from common.genai_client import prewarm, record_usage, warmed
 from common.loading import spinner
-from common.prompts import prompt_commit_message, select_option, text_input
+from common.prompts import (
+    SYSTEM_COMMIT_MESSAGE_FROM_SUMMARIES,
+    SYSTEM_COMMIT_MESSAGE_LARGE,
+    SYSTEM_COMMIT_MESSAGE_MEDIUM,
+    SYSTEM_COMMIT_MESSAGE_SMALL,
+    prompt_commit_message,
+    prompt_commit_message_from_summaries,
+    select_option,
+    text_input,
+)
+from domains.commit.cache import commit_cache, commit_message_key, file_summary_key, summary_cache
+from domains.commit.candidates import CandidatePool
+from domains.commit.classify import ChangeSize, classify_change, diff_stats, model_for
+from domains.commit.diff import blob_ids
+from domains.commit.git import run_git, stream_git
+from domains.commit.map_reduce import is_large_diff, summarize_diff
+from domains.commit.refine import RefineSession
+from domains.commit.preprocess import PreprocessOptions, PreprocessedDiff, context_lines, fit_diff, preprocess_diff
+from domains.commit.watch import watch_index
 from rich.console import Console
 
+MODEL = "models/gemini-flash-latest"
+
+SYSTEM_COMMIT_MESSAGE_BY_SIZE = {
+    ChangeSize.SMALL: SYSTEM_COMMIT_MESSAGE_SMALL,
+    ChangeSize.MEDIUM: SYSTEM_COMMIT_MESSAGE_MEDIUM,
+    ChangeSize.LARGE: SYSTEM_COMMIT_MESSAGE_LARGE,
+}
+
+@dataclass(frozen=True)
+class _Staged:
+    # The staged change as it is sent to the model, and where its message is cached.
+    diff: PreprocessedDiff
+    size: ChangeSize
+    model: str
+    cache: Optional[SQLiteCache]
+    cache_key: str
 
 class Command(BaseCommand):
     """Commit command input."""
     action: str
+    candidates: int = 1
 
 class CommandResponse(BaseFrozen, ToJSON):
     message: str
@@ -26,6 +65,16 @@ class CommandResponse(BaseFrozen, ToJSON):
 class Handler(BaseCommandHandler[Command]):
     """Handler for commit command execution."""
 
+    def __init__(self):
+        # File summaries of a large diff, computed once and shared by all candidates and Adjust.
+        self._summaries: Optional["asyncio.Future[str]"] = None
+        # Cache of file summaries and the key of a summary by file path and piece index.
+        self._summary_cache: Optional[SQLiteCache] = None
+        self._summary_key: Optional[Callable[[str, int], Optional[str]]] = None
+        self._token_budget = PreprocessOptions().token_budget
+        # Chat session shared by all "Adjust" turns, with the diff in a cached context when possible.
+        self._refine_session: Optional[RefineSession] = None
+
     async def handle_command(self, command: Command) -> tuple[Dict[str, Any], int]:
         """Execute google-genai to analyze the diffs to generate a commit message."""
 
@@ -33,88 +82,216 @@ class Handler(BaseCommandHandler[Command]):
         if not api_key:
             raise BadRequest(message="GOOGLE_API_KEY not found in environment. Set it in .env file")
 
-        if command.action != "generate":
+        if command.action not in ("generate", "watch"):
             print(f"Unsupported commit action: {command.action}")
 
         path = os.getcwd()
-        git_diff = subprocess.run(["git", "diff", "--staged"], capture_output=True, text=True, cwd=path)
+        if command.action == "watch":
+            return await self._watch(api_key, path)
 
-        if not git_diff.stdout.strip():
+        staged = await self._read_staged(api_key, path)
+        if not staged.diff.text.strip():
             print(f"No staged changes found. Use 'git add' to stage files.")
 
         console = Console()
-        message_text = await self._generate_commit_message(api_key, git_diff.stdout)
-
-        while True:
-            console.print("")
-            console.print(message_text)
-            console.print("")
-
-            selection = await select_option(
-                "Select action:",
-                [
-                    ("Commit & Push", "commit_push"),
-                    ("Commit", "commit"),
-                    ("Regenerate", "regenerate"),
-                    ("Adjust", "adjust"),
-                    ("Cancel", "cancel"),
-                ],
-            )
-
-            if not selection or selection == "cancel":
-                return json_response(
-                    CommandResponse(message="cancelled", commit_message=message_text, action="cancel"),
-                    200,
+        diff = staged.diff
+        size, model = staged.size, staged.model
+        cache, cache_key = staged.cache, staged.cache_key
+        for note in diff.omitted:
+            console.print(f"[dim]Not sent to the model: {note}[/dim]")
+        cached = cache.get(cache_key) if cache else None
+
+        # Spare candidates are generated in the background for "Regenerate".
+        candidates = CandidatePool(
+            lambda: self._generate_commit_message(api_key, diff.text, size, model), spares=command.candidates - 1
+        )
+        try:
+            if cached is not None:
+                console.print("[dim]Showing the last message generated for this staged tree[/dim]")
+                message_text = cached
+                candidates.fill()
+            else:
+                message_text = await self._next_candidate(candidates)
+
+            while True:
+                if cache:
+                    cache.put(cache_key, message_text)
+
+                console.print("")
+                console.print(message_text)
+                console.print("")
+
+                selection = await select_option(
+                    "Select action:",
+                    [
+                        ("Commit & Push", "commit_push"),
+                        ("Commit", "commit"),
+                        ("Regenerate", "regenerate"),
+                        ("Adjust", "adjust"),
+                        ("Cancel", "cancel"),
+                    ],
                 )
 
-            if selection == "regenerate":
-                message_text = await self._generate_commit_message(api_key, git_diff.stdout)
-                continue
+                if not selection or selection == "cancel":
+                    return json_response(
+                        CommandResponse(message="cancelled", commit_message=message_text, action="cancel"),
+                        200,
+                    )
+
+                if selection == "regenerate":
+                    with metrics.timed("commit.regenerate_wait_ms"):
+                        message_text = await self._next_candidate(candidates)
+                    continue
 
-            if selection == "adjust":
-                adjustment = await text_input("What adjustments would you like?")
+                if selection == "adjust":
+                    adjustment = await text_input("What adjustments would you like?")
 
-                if not adjustment:
+                    if not adjustment:
+                        continue
+
+                    message_text = await self._refine_commit_message(api_key, message_text, adjustment, diff.text, size)
                     continue
 
-                message_text = await self._refine_commit_message(api_key, message_text, adjustment, git_diff.stdout)
-                continue
+                if selection == "commit":
+                    success, output = await self._perform_commit(message_text, path)
+                    console.print(output)
+                    status = 200 if success else 400
+                    return json_response(
+                        CommandResponse(message="commit" if success else "commit_failed", commit_message=message_text, action="commit"),
+                        status,
+                    )
 
-            if selection == "commit":
-                success, output = self._perform_commit(message_text, path)
-                console.print(output)
-                status = 200 if success else 400
-                return json_response(
-                    CommandResponse(message="commit" if success else "commit_failed", commit_message=message_text, action="commit"),
-                    status,
-                )
+                if selection == "commit_push":
+                    success_commit, output_commit = await self._perform_commit(message_text, path)
+                    console.print(output_commit)
+                    if not success_commit:
+                        return json_response(
+                            CommandResponse(
+                                message="commit_failed",
+                                commit_message=message_text,
+                                action="commit_push",
+                            ),
+                            400,
+                        )
+
+                    success_push, output_push = await self._perform_push(path, console)
+                    console.print(output_push)
+                
+                    status = 200 if success_push else 400
 
-            if selection == "commit_push":
-                success_commit, output_commit = self._perform_commit(message_text, path)
-                console.print(output_commit)
-                if not success_commit:
                     return json_response(
                         CommandResponse(
-                            message="commit_failed",
+                            message="commit_push" if success_push else "push_failed",
                             commit_message=message_text,
                             action="commit_push",
                         ),
-                        400,
+                        status,
                     )
+        finally:
+            candidates.close()
+            if self._refine_session is not None:
+                await self._refine_session.close()
+
+    async def _read_staged(self, api_key: str, path: str) -> "_Staged":
+        # The diff and the staged tree id are read while the model connection is being opened.
+        options = PreprocessOptions.from_env()
+        git_diff = asyncio.ensure_future(run_git("diff", "--staged", f"--unified={context_lines()}", cwd=path))
+        git_tree = asyncio.ensure_future(asyncio.gather(
+            run_git("write-tree", cwd=path),
+            run_git("rev-parse", "--verify", "--quiet", "HEAD^{tree}", cwd=path),
+            run_git("rev-parse", "--absolute-git-dir", cwd=path),
+            run_git("diff", "--staged", "--raw", "--no-abbrev", cwd=path),
+        ))
+        prewarm(api_key)
+        staged = await git_diff
+        tree, head_tree, git_dir, raw = await git_tree
+
+        # The size class picks the prompt (and possibly the model) without asking the model.
+        stats = diff_stats(staged.stdout, options.exclude)
+        size = classify_change(stats)
+        model = model_for(size, MODEL)
+        metrics.record(f"commit.size.{size.value}", 1)
+        metrics.record("commit.files_changed", stats.files)
+        metrics.record("commit.lines_changed", stats.lines)
+
+        cache = commit_cache(Path(git_dir.stdout.strip())) if tree.ok and git_dir.ok else None
+        # HEAD has no tree before the first commit; the empty id stands for it.
+        head = head_tree.stdout.strip() if head_tree.ok else ""
+        cache_key = commit_message_key(tree.stdout.strip(), head, model, options, context_lines())
+
+        # File summaries of a large diff are cached per blob pair, so only new changes are summarized.
+        self._summaries = None
+        if git_dir.ok and raw.ok:
+            blobs = blob_ids(raw.stdout)
+            self._summary_cache = summary_cache(Path(git_dir.stdout.strip()))
+            self._summary_key = lambda file, part: (
+                file_summary_key(file, blobs[file], part, MODEL, options, context_lines()) if file in blobs else None
+            )
 
-                success_push, output_push = self._perform_push(path)
-                console.print(output_push)
-                
-                status = 200 if success_push else 400
-
-                return json_response(
-                    CommandResponse(
-                        message="commit_push" if success_push else "push_failed",
-                        commit_message=message_text,
-                        action="commit_push",
-                    ),
-                    status,
-                )
+        # A diff summarized piece by piece is cut to the budget per piece, not as a whole.
+        diff = preprocess_diff(staged.stdout, options, fit=False)
+        if not is_large_diff(diff.text):
+            diff = fit_diff(diff, options)
+        self._token_budget = options.token_budget
+
+        # Nothing staged means nothing to describe: no message is looked up or stored.
+        if not diff.text.strip():
+            cache = None
+
+        return _Staged(diff=diff, size=size, model=model, cache=cache, cache_key=cache_key)
+
+    async def _watch(self, api_key: str, path: str) -> tuple[Dict[str, Any], int]:
+        git_dir = await run_git("rev-parse", "--absolute-git-dir", cwd=path)
+        if not git_dir.ok:
+            raise BadRequest(message=git_dir.output.strip() or "Not a git repository")
+        if commit_cache(Path(git_dir.stdout.strip())) is None:
+            raise BadRequest(message="Watching needs the commit message cache; unset QUICK_COMMIT_CACHE=0")
+
+        console = Console()
+        console.print("[dim]Watching the index for staged changes (Ctrl+C to stop)[/dim]")
+        running: Optional["asyncio.Task[None]"] = None
+        running_tree = None
+        try:
+            async for _ in watch_index(Path(git_dir.stdout.strip()) / "index"):
+                tree = await run_git("write-tree", cwd=path)
+                if not tree.ok or tree.stdout == running_tree:
+                    continue
+                # Whatever is running was generated for a tree that is no longer staged.
+                if running is not None and not running.done():
+                    self._cancel(running)
+                    metrics.record("commit.watch_cancelled", 1)
+                running_tree = tree.stdout
+                running = asyncio.ensure_future(self._speculate(api_key, path, console))
+        finally:
+            if running is not None:
+                self._cancel(running)
+        return json_response(CommandResponse(message="watch_stopped", action="watch"), 200)
+
+    async def _speculate(self, api_key: str, path: str, console: Console) -> None:
+        try:
+            staged = await self._read_staged(api_key, path)
+            if not staged.diff.text.strip() or not staged.cache or staged.cache.get(staged.cache_key) is not None:
+                return
+            with metrics.timed("commit.watch_generate_ms"):
+                message_text = await self._generate_commit_message(api_key, staged.diff.text, staged.size, staged.model)
+            staged.cache.put(staged.cache_key, message_text)
+            console.print(f"[dim]Message ready: {message_text.splitlines()[0]}[/dim]")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            console.print(f"[dim]Speculative generation failed: {e}[/dim]")
+
+    def _cancel(self, task: "asyncio.Task[None]") -> None:
+        task.cancel()
+        # The shared summaries are shielded from their waiters and must be cancelled on their own.
+        if self._summaries is not None:
+            self._summaries.cancel()
+
+    async def _next_candidate(self, candidates: CandidatePool) -> str:
+        if candidates.ready():
+            return await candidates.next()
+        with spinner("Generating…", spinner_style="dots"):
+            return await candidates.next()
 
     def _get_text_parts(
         self, response: types.GenerateContentResponse
@@ -126,16 +303,20 @@ class Handler(BaseCommandHandler[Command]):
             for p in (getattr(getattr(c, "content", None), "parts", ()) or ())
         )
 
-    async def _generate_commit_message(self, api_key: str, diff: str) -> str:
-        with spinner("Generating…", spinner_style="dots"):
-            response = await genai.Client(api_key=api_key).aio.models.generate_content(
-                model="models/gemini-flash-latest",
-                contents=diff,
-                config=types.GenerateContentConfig(
-                    system_instruction=prompt_commit_message(diff),
-                    response_mime_type="text/plain",
-                ),
+    async def _generate_commit_message(self, api_key: str, diff: str, size: ChangeSize, model: str) -> str:
+        with metrics.timed("commit.generate_ms"):
+            await warmed(api_key)
+            if is_large_diff(diff):
+                system_instruction = SYSTEM_COMMIT_MESSAGE_FROM_SUMMARIES
+                contents = prompt_commit_message_from_summaries(await self._diff_summaries(api_key, diff))
+            else:
+                system_instruction = SYSTEM_COMMIT_MESSAGE_BY_SIZE[size]
+                contents = prompt_commit_message(diff)
+
+            response = await generate_content(
+                api_key, model, system_instruction, contents, response_mime_type="text/plain"
             )
+        record_usage("commit", response)
         parts = self._get_text_parts(response)
         message_text = "".join(
             text for p in parts if (text := getattr(p, "text", None))
@@ -145,58 +326,40 @@ class Handler(BaseCommandHandler[Command]):
         return message_text
 
     async def _refine_commit_message(
-        self, api_key: str, current_message: str, adjustment: str, diff: str
+        self, api_key: str, current_message: str, adjustment: str, diff: str, size: ChangeSize
     ) -> str:
-        system = (
-            "You revise commit messages. Use the diff and the user's adjustment to produce a polished commit message. "
-            "Preserve required formatting rules: SMALL=single line; MEDIUM/LARGE=title, blank line, bullets prefixed with '- '."
-        )
-        contents = f"<diff>\n{diff}\n</diff>\n<current>\n{current_message}\n</current>\n<adjustment>\n{adjustment}\n</adjustment>"
+        if self._refine_session is None:
+            # Large diffs are represented by their file summaries here as well.
+            changes = await self._diff_summaries(api_key, diff) if is_large_diff(diff) else diff
+            self._refine_session = RefineSession(api_key, MODEL, changes, size)
+
         with spinner("Refining…", spinner_style="dots"):
-            response = await genai.Client(api_key=api_key).aio.models.generate_content(
-                model="models/gemini-flash-latest",
-                contents=contents,
-                config=types.GenerateContentConfig(
-                    system_instruction=system,
-                    response_mime_type="text/plain",
-                ),
-            )
-        parts = self._get_text_parts(response)
-        refined = "".join(text for p in parts if (text := getattr(p, "text", None)))
+            refined = await self._refine_session.refine(current_message, adjustment)
         if not refined.strip():
             raise BadRequest(message="Empty response from translation service")
         return refined
 
-    def _perform_commit(self, message_text: str, cwd: str) -> tuple[bool, str]:
-        with tempfile.NamedTemporaryFile("w", delete=False) as tmp:
-            tmp.write(message_text)
-            tmp_path = tmp.name
-        try:
-            result = subprocess.run(
-                ["git", "commit", "-F", tmp_path],
-                capture_output=True,
-                text=True,
-                cwd=cwd,
+    async def _diff_summaries(self, api_key: str, diff: str) -> str:
+        if self._summaries is None:
+            self._summaries = asyncio.ensure_future(
+                summarize_diff(api_key, MODEL, diff, self._token_budget, self._summary_cache, self._summary_key)
             )
-            success = result.returncode == 0
-            output = (result.stdout or "") + (result.stderr or "")
-            return success, output
-        finally:
-            try:
-                os.unlink(tmp_path)
-            except Exception:
-                pass
-
-    def _perform_push(self, cwd: str) -> tuple[bool, str]:
-        result = subprocess.run(
-            ["git", "push"], capture_output=True, text=True, cwd=cwd
-        )
-        success = result.returncode == 0
-        output = (result.stdout or "") + (result.stderr or "")
-        return success, output
+        # Shielded so that cancelling one candidate does not cancel the summaries others wait for.
+        return await asyncio.shield(self._summaries)
+
+    async def _perform_commit(self, message_text: str, cwd: str) -> tuple[bool, str]:
+        result = await run_git("commit", "-F", "-", cwd=cwd, input=message_text)
+        return result.ok, result.output
+
+    async def _perform_push(self, cwd: str, console: Console) -> tuple[bool, str]:
+        with console.status("Pushing…", spinner="dots") as status:
+            result = await stream_git(
+                "push", "--progress", cwd=cwd, on_progress=lambda line: status.update(f"Pushing… {line}")
+            )
+        return result.ok, result.output
 
 
-async def execute_commit(action: Optional[str]) -> int:
+async def execute_commit(action: Optional[str], candidates: int = 1) -> int:
     """
     Execute commit command with CLI validation.
 
@@ -204,6 +367,8 @@ async def execute_commit(action: Optional[str]) -> int:
 
     Args:
         action: The commit action to execute (e.g., "generate")
+        candidates: Number of commit messages generated concurrently, the extras
+            being kept ready for "Regenerate"
 
     Returns:
         Exit code: 0 for success, 1 for failure
@@ -213,7 +378,7 @@ async def execute_commit(action: Optional[str]) -> int:
             print("Error: Commit action is required")
             return 1
 
-        request_data = {"action": action}
+        request_data = {"action": action, "candidates": candidates}
 
         response, status_code = await execute_command_handler(Command, request_data, Handler)
 
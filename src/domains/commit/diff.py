@@ -0,0 +1,103 @@
+"""
+Parsing of unified git diffs into per-file sections and hunk groups.
+
+Large diffs are summarized piece by piece, so they are split at file boundaries
+and, for files with very large changes, further at hunk boundaries into groups of
+bounded size. Every piece keeps the file header so it can be read on its own.
+"""
+
+import re
+
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+FILE_HEADER = re.compile(r"^diff --git ", re.MULTILINE)
+HUNK_HEADER = re.compile(r"^@@ ", re.MULTILINE)
+PATH = re.compile(r"^diff --git a/(.*?) b/(.*)$", re.MULTILINE)
+# ":<old mode> <new mode> <old blob> <new blob> <status>\t<path>[\t<new path>]"
+RAW_LINE = re.compile(r"^:\d+ \d+ ([0-9a-f]+) ([0-9a-f]+) [A-Z]\d*\t(?:[^\t\n]*\t)?(.*)$", re.MULTILINE)
+
+
+@dataclass(frozen=True)
+class FileDiff:
+    """The part of a diff that changes one file."""
+    path: str
+    text: str
+
+    @property
+    def lines(self) -> int:
+        """Number of lines of this part of the diff."""
+        return self.text.count("\n") + (not self.text.endswith("\n"))
+
+
+def split_files(diff: str) -> List[FileDiff]:
+    """
+    Split a unified git diff into one section per changed file.
+
+    Args:
+        diff: Output of `git diff`
+
+    Returns:
+        Sections in diff order; text before the first file header is dropped
+    """
+    starts = [match.start() for match in FILE_HEADER.finditer(diff)]
+    sections = []
+    for start, end in zip(starts, starts[1:] + [len(diff)]):
+        text = diff[start:end]
+        path = PATH.match(text)
+        sections.append(FileDiff(path=path.group(2) if path else text.split("\n", 1)[0], text=text))
+    return sections
+
+
+def split_hunks(file_diff: FileDiff, max_lines: int) -> List[FileDiff]:
+    """
+    Split a file's diff into groups of whole hunks of at most `max_lines` lines.
+
+    Each group repeats the file header. A single hunk longer than the limit
+    forms a group of its own.
+
+    Args:
+        file_diff: Section of one file
+        max_lines: Line budget of each group
+
+    Returns:
+        The section itself when it fits the budget, otherwise its hunk groups
+    """
+    if file_diff.lines <= max_lines:
+        return [file_diff]
+
+    starts = [match.start() for match in HUNK_HEADER.finditer(file_diff.text)]
+    if not starts:
+        return [file_diff]
+
+    header = file_diff.text[:starts[0]]
+    groups: List[FileDiff] = []
+    current = ""
+    for start, end in zip(starts, starts[1:] + [len(file_diff.text)]):
+        hunk = file_diff.text[start:end]
+        if current and (current + hunk).count("\n") > max_lines:
+            groups.append(FileDiff(path=file_diff.path, text=header + current))
+            current = ""
+        current += hunk
+    if current:
+        groups.append(FileDiff(path=file_diff.path, text=header + current))
+    return groups
+
+
+def split_diff(diff: str, max_lines: int) -> List[FileDiff]:
+    """Split a diff into per-file pieces, dividing files longer than `max_lines` at hunk boundaries."""
+    return [piece for file_diff in split_files(diff) for piece in split_hunks(file_diff, max_lines)]
+
+
+def blob_ids(raw: str) -> Dict[str, Tuple[str, str]]:
+    """
+    Read the old and new blob ids of every changed file.
+
+    Args:
+        raw: Output of `git diff --raw --no-abbrev`
+
+    Returns:
+        (old blob, new blob) pair by path after the change; a side that does not
+        exist has the all-zero id
+    """
+    return {match.group(3): (match.group(1), match.group(2)) for match in RAW_LINE.finditer(raw)}
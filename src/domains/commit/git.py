@@ -0,0 +1,116 @@
+"""
+Asynchronous git runner.
+
+Git commands run as asyncio subprocesses so that they never block the event
+loop: the staged diff can be read while the model connection is being opened,
+and a push reports its progress while the interface stays responsive. Every
+call is timed in the metrics under "git.<subcommand>_ms".
+"""
+
+import asyncio
+import codecs
+import re
+
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from common import metrics
+
+# Git separates progress updates with carriage returns and finished lines with newlines.
+PROGRESS_SEPARATOR = re.compile(r"[\r\n]+")
+
+
+@dataclass(frozen=True)
+class GitResult:
+    """Exit status and output of a git command."""
+    returncode: int
+    stdout: str
+    stderr: str
+
+    @property
+    def ok(self) -> bool:
+        """Whether the command exited successfully."""
+        return self.returncode == 0
+
+    @property
+    def output(self) -> str:
+        """Standard output followed by standard error."""
+        return self.stdout + self.stderr
+
+
+async def run_git(*args: str, cwd: str, input: Optional[str] = None) -> GitResult:
+    """
+    Run a git command and capture its output.
+
+    Args:
+        *args: Git arguments, e.g. "diff", "--staged"
+        cwd: Working directory of the repository
+        input: Text written to the command's standard input
+
+    Returns:
+        The command's exit status and decoded output
+    """
+    with metrics.timed(f"git.{args[0]}_ms"):
+        process = await asyncio.create_subprocess_exec(
+            "git", *args,
+            cwd=cwd,
+            stdin=asyncio.subprocess.PIPE if input is not None else asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        stdout, stderr = await process.communicate(input.encode() if input is not None else None)
+    return GitResult(
+        returncode=process.returncode or 0,
+        stdout=stdout.decode(errors="replace"),
+        stderr=stderr.decode(errors="replace"),
+    )
+
+
+async def stream_git(*args: str, cwd: str, on_progress: Callable[[str], None]) -> GitResult:
+    """
+    Run a git command, reporting every progress update of its standard error.
+
+    Args:
+        *args: Git arguments, e.g. "push", "--progress"
+        cwd: Working directory of the repository
+        on_progress: Called with each non-empty progress or output line
+
+    Returns:
+        The command's exit status and decoded output; stderr holds the last
+        state of every progress line
+    """
+    with metrics.timed(f"git.{args[0]}_ms"):
+        process = await asyncio.create_subprocess_exec(
+            "git", *args,
+            cwd=cwd,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        assert process.stdout is not None and process.stderr is not None
+
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        received = pending = ""
+        stdout_task = asyncio.ensure_future(process.stdout.read())
+        while chunk := await process.stderr.read(4096):
+            text = decoder.decode(chunk)
+            received += text
+            *updates, pending = PROGRESS_SEPARATOR.split(pending + text)
+            for update in updates:
+                if update.strip():
+                    on_progress(update.strip())
+        if pending.strip():
+            on_progress(pending.strip())
+
+        stdout = await stdout_task
+        await process.wait()
+    return GitResult(
+        returncode=process.returncode or 0,
+        stdout=stdout.decode(errors="replace"),
+        stderr=_final_lines(received),
+    )
+
+
+def _final_lines(text: str) -> str:
+    # A line rewritten with carriage returns keeps only its last state.
+    return "\n".join(line.rstrip("\r").rsplit("\r", 1)[-1] for line in text.split("\n"))
@@ -0,0 +1,101 @@
+"""
+Map-reduce summarization of large staged diffs.
+
+Sending a very large diff in one request is slow and can exceed the model's
+limits. Above a size threshold the diff is split into per-file pieces (large files
+at hunk boundaries), every piece is summarized concurrently with a small prompt
+(map), and the commit message is written from the summaries (reduce). Generation
+time then grows with the largest piece rather than with the whole diff.
+
+Summaries can be stored in a cache under a key given per piece; pieces found
+there are not sent to the model, so a diff that grew by a few files since the
+last run only costs the summaries of those files.
+
+Configuration (environment variables):
+    QUICK_COMMIT_MAP_REDUCE_LINES   Diff size in lines from which map-reduce is used (default: 1000)
+"""
+
+import asyncio
+import os
+
+from typing import Callable, Optional
+
+from common import metrics
+from common.cache import SQLiteCache
+from common.command.execute_command_handler import BadRequest, retrying_on_failure
+from common.context_cache import generate_content
+from common.genai_client import record_usage
+from common.prompts import SYSTEM_SUMMARIZE_FILE_DIFF, prompt_summarize_file_diff
+from domains.commit.diff import FileDiff, split_files, split_hunks
+from domains.commit.preprocess import fit_text
+
+# Line budget of one summarized piece.
+MAX_PIECE_LINES = 400
+MAP_CONCURRENCY = 8
+MAP_RETRIES = 3
+
+
+def is_large_diff(diff: str) -> bool:
+    """Return whether a diff is large enough to be summarized piece by piece."""
+    return diff.count("\n") >= int(os.getenv("QUICK_COMMIT_MAP_REDUCE_LINES", "1000"))
+
+
+async def summarize_diff(
+    api_key: str,
+    model: str,
+    diff: str,
+    token_budget: int,
+    cache: Optional[SQLiteCache] = None,
+    piece_key: Optional[Callable[[str, int], Optional[str]]] = None,
+) -> str:
+    """
+    Summarize every piece of a diff concurrently.
+
+    Args:
+        api_key: Google API key used to authenticate requests
+        model: Model used for the summaries
+        diff: Output of `git diff --staged`, filtered but not fitted to one prompt
+        token_budget: Estimated input tokens each summarized piece, and the
+            combined summaries, may use
+        cache: Cache of piece summaries, if any
+        piece_key: Returns the cache key of a piece from its path and its index
+            among the pieces of that file, or None when it must not be cached
+
+    Returns:
+        One "- path: summary" line per piece, in diff order
+    """
+    pieces = [
+        (piece, part)
+        for file_diff in split_files(diff)
+        for part, piece in enumerate(split_hunks(file_diff, MAX_PIECE_LINES))
+    ]
+    semaphore = asyncio.Semaphore(MAP_CONCURRENCY)
+
+    async def summarize(piece: FileDiff, part: int) -> str:
+        key = piece_key(piece.path, part) if cache and piece_key else None
+        cached = cache.get(key) if cache and key else None
+        if cached is not None:
+            metrics.record("commit.map_cached", 1)
+            return cached
+
+        async def attempt() -> str:
+            response = await generate_content(
+                api_key,
+                model,
+                SYSTEM_SUMMARIZE_FILE_DIFF,
+                prompt_summarize_file_diff(piece.path, fit_text(piece.text, token_budget)),
+            )
+            record_usage("commit.map", response)
+            if not response.text or not response.text.strip():
+                raise BadRequest(message=f"Empty summary for {piece.path}")
+            return " ".join(response.text.split())
+
+        async with semaphore:
+            summary = await retrying_on_failure(MAP_RETRIES, attempt, backoff_seconds=1.0)
+        if cache and key:
+            cache.put(key, summary)
+        return summary
+
+    with metrics.timed("commit.map_ms"):
+        summaries = await asyncio.gather(*(summarize(piece, part) for piece, part in pieces))
+    return fit_text("\n".join(f"- {piece.path}: {summary}" for (piece, _), summary in zip(pieces, summaries)), token_budget)
@@ -0,0 +1,223 @@
+"""
+Preprocessing of staged diffs before they are sent to the model.
+
+Lockfiles, generated code, minified assets and binary files cost many input
+tokens and say little about a change, so they are replaced by one-line numstat
+stubs and whitespace-only hunks are dropped. A diff sent in a single prompt is
+then fitted to it: huge hunks are replaced by their line counts and, when the
+diff still exceeds the token budget, the largest files are stubbed until it fits.
+A diff summarized piece by piece is not fitted as a whole; each piece and the
+combined summaries are cut to the budget instead (see `fit_text`). Every omission
+is reported so the user knows what the model saw. Context lines are trimmed by
+git itself (see `context_lines`).
+
+Configuration (environment variables):
+    QUICK_COMMIT_EXCLUDE            Comma-separated globs of paths to stub (default: lockfiles, minified and generated files)
+    QUICK_COMMIT_CONTEXT_LINES      Context lines around each change (default: 1)
+    QUICK_COMMIT_MAX_HUNK_LINES     Hunks longer than this are replaced by their counts (default: 300)
+    QUICK_COMMIT_TOKEN_BUDGET       Estimated input tokens the diff may use (default: 60000)
+"""
+
+import os
+import re
+
+from dataclasses import dataclass, field
+from fnmatch import fnmatch
+from typing import List, Optional, Tuple
+
+from domains.commit.diff import HUNK_HEADER, FileDiff, split_files
+
+DEFAULT_EXCLUDE = (
+    "*.lock", "*-lock.json", "*-lock.yaml", "*.lockb", "go.sum",
+    "*.min.js", "*.min.css", "*.map", "*.snap",
+    "*_pb2.py", "*_pb2_grpc.py", "*.pb.go", "*.generated.*",
+    "dist/*", "build/*", "vendor/*", "node_modules/*",
+)
+
+# Rough number of characters per token of source code.
+CHARS_PER_TOKEN = 4
+
+BINARY_MARKER = re.compile(r"^(Binary files .* differ|GIT binary patch)$", re.MULTILINE)
+
+
+def context_lines() -> int:
+    """Return the number of context lines to request from `git diff`."""
+    return int(os.getenv("QUICK_COMMIT_CONTEXT_LINES", "1"))
+
+
+@dataclass(frozen=True)
+class PreprocessOptions:
+    """Limits applied to a diff before it is sent to the model."""
+    exclude: Tuple[str, ...] = DEFAULT_EXCLUDE
+    max_hunk_lines: int = 300
+    token_budget: int = 60000
+
+    @classmethod
+    def from_env(cls) -> "PreprocessOptions":
+        """Build the options from the QUICK_COMMIT_* environment variables."""
+        exclude = os.getenv("QUICK_COMMIT_EXCLUDE")
+        return cls(
+            exclude=tuple(glob.strip() for glob in exclude.split(",") if glob.strip()) if exclude is not None else DEFAULT_EXCLUDE,
+            max_hunk_lines=int(os.getenv("QUICK_COMMIT_MAX_HUNK_LINES", "300")),
+            token_budget=int(os.getenv("QUICK_COMMIT_TOKEN_BUDGET", "60000")),
+        )
+
+
+@dataclass(frozen=True)
+class PreprocessedDiff:
+    """A diff reduced for the model, with a note for every omission."""
+    text: str
+    omitted: List[str] = field(default_factory=list)
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of model tokens in a diff."""
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def numstat(text: str) -> Tuple[int, int]:
+    """Count the added and removed lines of a diff, ignoring file headers."""
+    added = removed = 0
+    for line in text.splitlines():
+        if line.startswith("+") and not line.startswith("+++"):
+            added += 1
+        elif line.startswith("-") and not line.startswith("---"):
+            removed += 1
+    return added, removed
+
+
+def is_excluded(path: str, exclude: Tuple[str, ...]) -> bool:
+    """Return whether a path matches one of the exclusion globs, by full path or file name."""
+    name = os.path.basename(path)
+    return any(fnmatch(path, glob) or fnmatch(name, glob) for glob in exclude)
+
+
+def _header(file_diff: FileDiff) -> str:
+    return file_diff.text.split("\n", 1)[0]
+
+
+def _stub(file_diff: FileDiff, reason: str) -> str:
+    added, removed = numstat(file_diff.text)
+    return f"{_header(file_diff)}\n[{reason}: +{added} -{removed} lines not shown]\n"
+
+
+def _is_whitespace_only(hunk: str) -> bool:
+    lines = hunk.splitlines()[1:]
+    removed = "".join("".join(line[1:].split()) for line in lines if line.startswith("-"))
+    added = "".join("".join(line[1:].split()) for line in lines if line.startswith("+"))
+    changed = any(line.startswith(("-", "+")) for line in lines)
+    return changed and removed == added
+
+
+def _reduce_hunks(file_diff: FileDiff, max_hunk_lines: Optional[int], omitted: List[str]) -> str:
+    starts = [match.start() for match in HUNK_HEADER.finditer(file_diff.text)]
+    if not starts:
+        return file_diff.text
+
+    kept = [file_diff.text[:starts[0]]]
+    whitespace_only = 0
+    for start, end in zip(starts, starts[1:] + [len(file_diff.text)]):
+        hunk = file_diff.text[start:end]
+        header, _, body = hunk.partition("\n")
+        if _is_whitespace_only(hunk):
+            whitespace_only += 1
+        elif max_hunk_lines is not None and body.count("\n") > max_hunk_lines:
+            added, removed = numstat(body)
+            kept.append(f"{header}\n[hunk too large: +{added} -{removed} lines not shown]\n")
+            omitted.append(f"{file_diff.path}: hunk {header.split('@@')[1].strip()} summarized (+{added} -{removed})")
+        else:
+            kept.append(hunk)
+
+    if whitespace_only:
+        omitted.append(f"{file_diff.path}: {whitespace_only} whitespace-only hunk(s) dropped")
+    return "".join(kept)
+
+
+def preprocess_diff(diff: str, options: PreprocessOptions, fit: bool = True) -> PreprocessedDiff:
+    """
+    Reduce a staged diff to what is worth sending to the model.
+
+    Args:
+        diff: Output of `git diff --staged`
+        options: Exclusion globs and size limits
+        fit: Whether to also fit the diff to a single prompt (see `fit_diff`);
+            disable it for diffs that are summarized piece by piece
+
+    Returns:
+        The reduced diff and a note for every file or hunk left out
+    """
+    omitted: List[str] = []
+    files: List[str] = []
+
+    for file_diff in split_files(diff):
+        if is_excluded(file_diff.path, options.exclude):
+            added, removed = numstat(file_diff.text)
+            files.append(_stub(file_diff, "excluded"))
+            omitted.append(f"{file_diff.path}: excluded by pattern (+{added} -{removed})")
+        elif BINARY_MARKER.search(file_diff.text):
+            files.append(f"{_header(file_diff)}\n[binary file changed]\n")
+            omitted.append(f"{file_diff.path}: binary content not shown")
+        else:
+            files.append(_reduce_hunks(file_diff, None, omitted))
+
+    filtered = PreprocessedDiff(text="".join(files), omitted=omitted)
+    return fit_diff(filtered, options) if fit else filtered
+
+
+def fit_diff(diff: PreprocessedDiff, options: PreprocessOptions) -> PreprocessedDiff:
+    """
+    Fit a filtered diff to a single prompt.
+
+    Hunks longer than the limit are replaced by their counts, then the largest
+    files are stubbed until the diff fits the token budget.
+
+    Args:
+        diff: Diff returned by `preprocess_diff(..., fit=False)`
+        options: Size limits
+
+    Returns:
+        The fitted diff, its notes extended with every further omission
+    """
+    omitted = list(diff.omitted)
+    files = [(file_diff, _reduce_hunks(file_diff, options.max_hunk_lines, omitted)) for file_diff in split_files(diff.text)]
+
+    # Stub the largest remaining files until the diff fits the budget.
+    total = sum(estimate_tokens(text) for _, text in files)
+    by_size = sorted(range(len(files)), key=lambda index: len(files[index][1]), reverse=True)
+    for index in by_size:
+        if total <= options.token_budget:
+            break
+        file_diff, text = files[index]
+        stub = _stub(file_diff, "over token budget")
+        if len(stub) >= len(text):
+            continue
+        total -= estimate_tokens(text) - estimate_tokens(stub)
+        files[index] = (file_diff, stub)
+        added, removed = numstat(file_diff.text)
+        omitted.append(f"{file_diff.path}: left out to fit the token budget (+{added} -{removed})")
+
+    return PreprocessedDiff(text="".join(text for _, text in files), omitted=omitted)
+
+
+def fit_text(text: str, token_budget: int) -> str:
+    """
+    Cut a text to its leading lines that fit a token budget.
+
+    Args:
+        text: A piece of a diff, or the combined summaries of a diff
+        token_budget: Estimated input tokens the text may use
+
+    Returns:
+        The text itself when it fits, otherwise its leading lines and a note
+        counting the lines left out
+    """
+    if estimate_tokens(text) <= token_budget:
+        return text
+    lines = text.splitlines(keepends=True)
+    kept = size = 0
+    for line in lines:
+        size += len(line)
+        if size > token_budget * CHARS_PER_TOKEN:
+            break
+        kept += 1
+    return "".join(lines[:kept]) + f"[{len(lines) - kept} more lines not shown]\n"
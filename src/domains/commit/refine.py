@@ -0,0 +1,105 @@
+"""
+Multi-turn refinement of a commit message.
+
+"Adjust" turns share one chat session. Whenever the API accepts it, the diff is
+stored with the instruction in a session-scoped cached content, so no turn sends
+the diff again and every turn adds only the current message and the requested
+adjustment. Diffs below the API's minimum cacheable size (or rejected by it) are
+part of the chat history instead, and the chat resends the whole history, diff
+included, on every turn; only the API's implicit prefix caching may discount it.
+Input and cached token counts are recorded per turn.
+
+Configuration (environment variables):
+    QUICK_REFINE_CACHE_MIN_TOKENS   Estimated diff size from which caching the diff is attempted (default: 1024, the API's minimum)
+"""
+
+import os
+
+from typing import TYPE_CHECKING, Optional, Tuple
+
+from common import metrics
+from common.context_cache import create_context, delete_context
+from common.genai_client import get_client, record_usage
+from common.prompts import SYSTEM_REFINE_COMMIT_MESSAGE, prompt_refine_changes, prompt_refine_commit_message, prompt_refine_turn
+from domains.commit.classify import ChangeSize
+from domains.commit.preprocess import estimate_tokens
+
+if TYPE_CHECKING:
+    from google.genai import chats
+
+# A refine session rarely lasts long; the cache is deleted when it ends anyway.
+SESSION_TTL_SECONDS = 900
+
+
+class RefineSession:
+    """
+    Chat session refining commit messages against one diff.
+
+    Args:
+        api_key: Google API key used to authenticate requests
+        model: Model used for the session
+        changes: Diff, or file summaries of a large diff, the messages describe
+        size: Size class of the change, deciding the format of the message
+    """
+
+    def __init__(self, api_key: str, model: str, changes: str, size: ChangeSize):
+        self.api_key = api_key
+        self.model = model
+        self.changes = changes
+        self.size = size
+        self._chat: Optional["chats.AsyncChat"] = None
+        self._cached_content: Optional[str] = None
+        self._turns = 0
+
+    async def refine(self, current_message: str, adjustment: str) -> str:
+        """
+        Revise a commit message according to an adjustment.
+
+        Args:
+            current_message: Message shown to the user
+            adjustment: Change the user asked for
+
+        Returns:
+            The revised message text, possibly empty
+        """
+        chat = self._chat
+        if chat is None:
+            chat, message = await self._start(current_message, adjustment)
+            self._chat = chat
+        else:
+            message = prompt_refine_turn(current_message, adjustment)
+
+        self._turns += 1
+        with metrics.timed("commit.refine_ms"):
+            response = await chat.send_message(message)
+        record_usage("commit.refine", response)
+        usage = response.usage_metadata
+        if usage is not None:
+            metrics.record(f"commit.refine.turn{self._turns}_prompt_tokens", usage.prompt_token_count or 0)
+        return response.text or ""
+
+    async def _start(self, current_message: str, adjustment: str) -> Tuple["chats.AsyncChat", str]:
+        from google.genai import types
+
+        if estimate_tokens(self.changes) >= int(os.getenv("QUICK_REFINE_CACHE_MIN_TOKENS", "1024")):
+            self._cached_content = await create_context(
+                self.api_key, self.model, SYSTEM_REFINE_COMMIT_MESSAGE,
+                prompt_refine_changes(self.changes, self.size.value), SESSION_TTL_SECONDS,
+            )
+
+        if self._cached_content:
+            config = types.GenerateContentConfig(cached_content=self._cached_content, response_mime_type="text/plain")
+            first_message = prompt_refine_turn(current_message, adjustment)
+        else:
+            config = types.GenerateContentConfig(
+                system_instruction=SYSTEM_REFINE_COMMIT_MESSAGE, response_mime_type="text/plain"
+            )
+            first_message = prompt_refine_commit_message(self.changes, self.size.value, current_message, adjustment)
+
+        return get_client(self.api_key).aio.chats.create(model=self.model, config=config), first_message
+
+    async def close(self) -> None:
+        """Delete the session's cached content, if one was created."""
+        if self._cached_content:
+            await delete_context(self.api_key, self._cached_content)
+            self._cached_content = None
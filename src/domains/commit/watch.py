@@ -0,0 +1,55 @@
+"""
+Watcher of the git index for speculative commit message generation.
+
+`quick --commit watch` polls the modification time and size of `.git/index`,
+which git rewrites on every `git add`, `git rm` or `git reset`. Bursts of staging
+are debounced so that a message is generated once the index has settled rather
+than for every intermediate tree. Polling keeps the watcher free of platform
+specific file notification dependencies; a stat call per interval is negligible.
+
+Configuration (environment variables):
+    QUICK_COMMIT_WATCH_INTERVAL     Seconds between two checks of the index (default: 0.5)
+    QUICK_COMMIT_WATCH_DEBOUNCE     Seconds the index must stay unchanged before generating (default: 1.5)
+"""
+
+import asyncio
+import os
+
+from pathlib import Path
+from typing import AsyncIterator, Optional, Tuple
+
+
+def _signature(index: Path) -> Optional[Tuple[int, int]]:
+    try:
+        stat = index.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+async def watch_index(index: Path) -> AsyncIterator[None]:
+    """
+    Yield once at start and then every time the index settles after a change.
+
+    Args:
+        index: Path of the repository's index file
+
+    Yields:
+        Nothing; each iteration means the staged content may have changed
+    """
+    interval = float(os.getenv("QUICK_COMMIT_WATCH_INTERVAL", "0.5"))
+    debounce = float(os.getenv("QUICK_COMMIT_WATCH_DEBOUNCE", "1.5"))
+    loop = asyncio.get_running_loop()
+
+    last = _signature(index)
+    changed_at: Optional[float] = None
+    yield None
+    while True:
+        await asyncio.sleep(interval)
+        current = _signature(index)
+        if current != last:
+            last = current
+            changed_at = loop.time()
+        elif changed_at is not None and loop.time() - changed_at >= debounce:
+            changed_at = None
+            yield None
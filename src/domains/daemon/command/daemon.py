@@ -0,0 +1,116 @@
+import asyncio
+import os
+import subprocess
+import sys
+
+from typing import Any, Dict, Optional
+
+from common.base import BaseFrozen, ToJSON
+from common.command.base_command import BaseCommand
+from common.command.base_command_handler import BaseCommandHandler
+from common.command.execute_command_handler import BadRequest, json_response, execute_command_handler
+from common.daemon import client
+from common.daemon.protocol import socket_path
+from common.paths import cache_dir, source_root
+
+STARTUP_TIMEOUT_SECONDS = 10.0
+
+
+class Command(BaseCommand):
+    """Daemon control command input."""
+    action: str
+
+class CommandResponse(BaseFrozen, ToJSON):
+    message: str
+    pid: Optional[int] = None
+
+class Handler(BaseCommandHandler[Command]):
+    """Handler for starting, stopping and inspecting the background daemon."""
+
+    async def handle_command(self, command: Command) -> tuple[Dict[str, Any], int]:
+        """Control the daemon process listening on the quick socket."""
+
+        match command.action:
+            case "start":
+                return await self._start()
+            case "stop":
+                return self._stop()
+            case "status":
+                return self._status()
+            case _:
+                raise BadRequest(message=f"Unsupported daemon action: {command.action}")
+
+    async def _start(self) -> tuple[Dict[str, Any], int]:
+        running = client.request({"control": "ping"})
+        if running:
+            print(f"Daemon already running (pid {running['pid']})")
+            return json_response(CommandResponse(message="already_running", pid=running["pid"]))
+
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(source_root()), env.get("PYTHONPATH")]))
+        with open(cache_dir() / "daemon.log", "ab") as log:
+            subprocess.Popen(
+                [sys.executable, "-m", "common.daemon.server"],
+                stdin=subprocess.DEVNULL,
+                stdout=log,
+                stderr=log,
+                env=env,
+                start_new_session=True,
+            )
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + STARTUP_TIMEOUT_SECONDS
+        while loop.time() < deadline:
+            started = client.request({"control": "ping"})
+            if started:
+                print(f"Daemon started (pid {started['pid']}), listening on {socket_path()}")
+                return json_response(CommandResponse(message="started", pid=started["pid"]))
+            await asyncio.sleep(0.1)
+
+        print(f"Daemon did not start within {STARTUP_TIMEOUT_SECONDS:.0f}s, see {cache_dir() / 'daemon.log'}")
+        return json_response(CommandResponse(message="start_failed"), 500)
+
+    def _stop(self) -> tuple[Dict[str, Any], int]:
+        if client.request({"control": "stop"}) is None:
+            print("Daemon is not running")
+            return json_response(CommandResponse(message="not_running"))
+
+        print("Daemon stopped")
+        return json_response(CommandResponse(message="stopped"))
+
+    def _status(self) -> tuple[Dict[str, Any], int]:
+        running = client.request({"control": "ping"})
+        if running is None:
+            print("Daemon is not running")
+            return json_response(CommandResponse(message="not_running"))
+
+        print(f"Daemon running (pid {running['pid']}), served {running['served']} request(s)")
+        return json_response(CommandResponse(message="running", pid=running["pid"]))
+
+
+async def execute_daemon(action: Optional[str]) -> int:
+    """
+    Execute daemon control command with CLI validation.
+
+    Validates input, constructs command, and executes handler.
+
+    Args:
+        action: The daemon action to execute ("start", "stop" or "status")
+
+    Returns:
+        Exit code: 0 for success, 1 for failure
+    """
+    try:
+        if not action:
+            print("Error: Daemon action is required")
+            return 1
+
+        request_data = {"action": action}
+
+        response, status_code = await execute_command_handler(Command, request_data, Handler)
+
+        return 0 if status_code == 200 else 1
+
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        return 1
@@ -0,0 +1,63 @@
+"""
+On-disk cache of translation results shared by all `quick` processes.
+
+Results are keyed by the normalized content, target language, model and prompt
+template version, so changing any of them never serves a stale rendering.
+
+Configuration (environment variables):
+    QUICK_TRANSLATE_CACHE              Set to "0" to disable the cache
+    QUICK_TRANSLATE_CACHE_TTL          Entry time to live in seconds (default: 30 days)
+    QUICK_TRANSLATE_CACHE_MAX_ENTRIES  Maximum number of cached translations (default: 10000)
+    QUICK_TRANSLATE_CACHE_MAX_MB       Maximum size of the cached text in MB (default: 64)
+"""
+
+import os
+import re
+import unicodedata
+
+from typing import Optional
+
+from common.cache import SQLiteCache
+from common.paths import cache_dir
+
+_cache: SQLiteCache | None = None
+
+def translation_cache() -> Optional[SQLiteCache]:
+    """
+    Return the process-wide translation cache, opening it on first use.
+
+    Returns:
+        The shared cache, or None when disabled with QUICK_TRANSLATE_CACHE=0
+    """
+    global _cache
+    if os.getenv("QUICK_TRANSLATE_CACHE", "1") == "0":
+        return None
+    if _cache is None:
+        _cache = SQLiteCache(
+            cache_dir() / "translations.sqlite3",
+            max_entries=int(os.getenv("QUICK_TRANSLATE_CACHE_MAX_ENTRIES", "10000")),
+            max_bytes=int(float(os.getenv("QUICK_TRANSLATE_CACHE_MAX_MB", "64")) * 1024 * 1024),
+            ttl_seconds=float(os.getenv("QUICK_TRANSLATE_CACHE_TTL", str(30 * 24 * 3600))),
+        )
+    return _cache
+
+
+def normalize_content(content: str) -> str:
+    """Normalize text so that inputs differing only in Unicode form or whitespace share a key."""
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFC", content)).strip()
+
+
+def translation_key(content: str, target_language: str, model: str, prompt_version: str) -> str:
+    """
+    Build the cache key of a translation.
+
+    Args:
+        content: Text being translated
+        target_language: Target language code
+        model: Model generating the translation
+        prompt_version: Version of the prompt template producing the output
+
+    Returns:
+        Content-addressed cache key
+    """
+    return SQLiteCache.key(normalize_content(content), target_language.lower(), model, prompt_version)
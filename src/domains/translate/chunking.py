@@ -0,0 +1,123 @@
+"""
+Splitting of long documents into translation chunks.
+
+Documents are split at paragraph boundaries, falling back to sentence and then
+word boundaries for paragraphs that exceed the token budget. Every chunk keeps the
+whitespace that followed it in the source, so joining the translated chunks with
+their separators restores the original layout, and the sentence preceding it, which
+is passed to the model as context for consistent terminology.
+"""
+
+import re
+
+from dataclasses import dataclass
+from typing import List, Tuple
+
+# Rough number of characters per token for Latin-script text.
+CHARS_PER_TOKEN = 4
+
+PARAGRAPH_BREAK = re.compile(r"(\n\s*\n)")
+SENTENCE_END = re.compile(r"(?<=[.!?…。！？])(\s+)")
+
+
+@dataclass(frozen=True)
+class Chunk:
+    """A contiguous piece of a document, translated as one request."""
+    index: int
+    text: str
+    separator: str
+    context: str
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of model tokens in a text."""
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def _split_keeping_separators(text: str, pattern: re.Pattern[str]) -> List[Tuple[str, str]]:
+    """Split text into (piece, following separator) pairs."""
+    parts = pattern.split(text)
+    pieces = parts[0::2]
+    separators = parts[1::2] + [""]
+    return [(piece, separator) for piece, separator in zip(pieces, separators) if piece]
+
+
+def _split_words(text: str, max_tokens: int) -> List[Tuple[str, str]]:
+    """Hard-split a single oversized sentence at word boundaries."""
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    pieces: List[Tuple[str, str]] = []
+    current = ""
+    for word, separator in _split_keeping_separators(text, re.compile(r"(\s+)")):
+        if current and len(current) + len(word) > max_chars:
+            stripped = current.rstrip()
+            pieces.append((stripped, current[len(stripped):]))
+            current = ""
+        current += word + separator
+    if current:
+        stripped = current.rstrip()
+        pieces.append((stripped, current[len(stripped):]))
+    return pieces
+
+
+def _segments(text: str, max_tokens: int) -> List[Tuple[str, str]]:
+    """Break a document into (segment, separator) pairs that each fit the budget."""
+    segments: List[Tuple[str, str]] = []
+    for paragraph, paragraph_separator in _split_keeping_separators(text, PARAGRAPH_BREAK):
+        if estimate_tokens(paragraph) <= max_tokens:
+            segments.append((paragraph, paragraph_separator))
+            continue
+
+        sentences = _split_keeping_separators(paragraph, SENTENCE_END)
+        for position, (sentence, separator) in enumerate(sentences):
+            is_last = position == len(sentences) - 1
+            if estimate_tokens(sentence) <= max_tokens:
+                pieces = [(sentence, separator)]
+            else:
+                # The sentence's own separator follows the last piece of its word split.
+                pieces = _split_words(sentence, max_tokens)
+                last_text, last_separator = pieces[-1]
+                pieces[-1] = (last_text, last_separator + separator)
+            if is_last:
+                last_text, last_separator = pieces[-1]
+                pieces[-1] = (last_text, last_separator + paragraph_separator)
+            segments.extend(pieces)
+    return segments
+
+
+def _last_sentence(text: str) -> str:
+    sentences = _split_keeping_separators(text.strip(), SENTENCE_END)
+    return sentences[-1][0] if sentences else ""
+
+
+def chunk_document(text: str, max_tokens: int) -> List[Chunk]:
+    """
+    Split a document into chunks of at most `max_tokens` estimated tokens.
+
+    Consecutive paragraphs (or sentences of an oversized paragraph) are packed
+    into the same chunk while they fit the budget.
+
+    Args:
+        text: Document to split
+        max_tokens: Token budget of each chunk
+
+    Returns:
+        Chunks in document order; "".join(c.text + c.separator) restores the text
+        apart from leading whitespace
+    """
+    chunks: List[Chunk] = []
+    current, current_separator = "", ""
+
+    def flush() -> None:
+        nonlocal current, current_separator
+        if current:
+            context = _last_sentence(chunks[-1].text) if chunks else ""
+            chunks.append(Chunk(index=len(chunks), text=current, separator=current_separator, context=context))
+        current, current_separator = "", ""
+
+    for segment, separator in _segments(text.lstrip(), max_tokens):
+        if current and estimate_tokens(current + current_separator + segment) > max_tokens:
+            flush()
+        current = current + current_separator + segment if current else segment
+        current_separator = separator
+    flush()
+    return chunks
@@ -0,0 +1,90 @@
+import sys
+
+from contextlib import nullcontext
+from itertools import chain
+from typing import Any, Dict, Optional
+
+from common.base import BaseFrozen, ToJSON
+from common.command.base_command import BaseCommand
+from common.command.base_command_handler import BaseCommandHandler
+from common.command.execute_command_handler import BadRequest, json_response, execute_command_handler
+from domains.translate.dictionary import build_dictionary, dictionary_path, open_dictionary, read_word_list
+
+STDIN = "-"
+
+
+class Command(BaseCommand):
+    """Dictionary import command input."""
+
+    source: str
+    target_language: str = "pt"
+
+
+class CommandResponse(BaseFrozen, ToJSON):
+    """Dictionary import command output."""
+
+    path: str
+    imported: int
+    terms: int
+
+
+class Handler(BaseCommandHandler[Command]):
+    """Handler merging a tab-separated word list into the offline dictionary of a language."""
+
+    async def handle_command(self, command: Command) -> tuple[Dict[str, Any], int]:
+        """Read the word list, merge it with the existing dictionary and rewrite the file."""
+
+        target_language = command.target_language.strip().lower()
+        if not target_language or "," in target_language:
+            raise BadRequest(message="Import into exactly one target language")
+
+        try:
+            stream = sys.stdin if command.source == STDIN else open(command.source, encoding="utf-8")
+        except OSError as e:
+            raise BadRequest(message=f"Cannot read word list: {e}")
+
+        # stdin belongs to the caller and stays open.
+        with stream if stream is not sys.stdin else nullcontext(stream):
+            imported = list(read_word_list(stream))
+        if not imported:
+            raise BadRequest(message="The word list has no 'term<TAB>translation' lines")
+
+        existing = open_dictionary(target_language)
+        path = dictionary_path(target_language)
+        terms = build_dictionary(chain(existing.items() if existing else (), imported), path)
+
+        return json_response(CommandResponse(path=str(path), imported=len(imported), terms=terms))
+
+
+async def execute_import_dictionary(source: Optional[str], target_language: str = "pt") -> int:
+    """
+    Execute dictionary import command with CLI validation.
+
+    Validates input, constructs command, and executes handler.
+
+    Args:
+        source: Path of the tab-separated word list, or "-" to read from stdin
+        target_language: Language code of the translations in the list
+
+    Returns:
+        Exit code: 0 for success, 1 for failure
+    """
+    try:
+        if not source:
+            print("Error: Word list file is required")
+            return 1
+
+        request_data = {"source": source, "target_language": target_language}
+
+        response, status_code = await execute_command_handler(Command, request_data, Handler)
+
+        if status_code != 200:
+            print(f"Error: {response['error']['message']}")
+            return 1
+
+        print(f"Imported {response['imported']} entries; {response['terms']} terms in {response['path']}")
+        return 0
+
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        return 1
@@ -1,17 +1,38 @@
 import os
+import re
 
-from typing import Any, Dict, Optional
+from contextlib import nullcontext
+from typing import Any, AsyncIterator, Dict, Optional
 from pydantic import BaseModel
-from google import genai
 
+from common import metrics
 from common.base import BaseFrozen, ToJSON
 from common.command.base_command import BaseCommand
 from common.command.base_command_handler import BaseCommandHandler
 from common.command.execute_command_handler import BadRequest, json_response, execute_command_handler
 
 from common.format_markdown import Format
+from common.context_cache import generate_content, generate_content_stream
+from common.genai_client import prewarm, record_usage, warmed
 from common.loading import spinner
-from common.prompts import prompt_translate
+from common.prompts import (
+    PROMPT_TRANSLATE_VERSION,
+    SYSTEM_TRANSLATE,
+    SYSTEM_TRANSLATE_WITH_HINT,
+    prompt_translate,
+    prompt_translate_with_hint,
+)
+from domains.translate.cache import translation_cache, translation_key
+from domains.translate.dictionary import is_short_term, open_dictionary
+from domains.translate.memory import fuzzy_threshold, translation_memory
+
+MODEL = "models/gemini-flash-latest"
+
+# Label of the translation line in the output format of prompt_translate. The prompt
+# pins it whatever the target language, so the line can be found for every language.
+TRANSLATION_LINE = re.compile(r"^\s*\*\*Translation:\*\*\s*(.+?)\s*$", re.MULTILINE)
+# Answers without the full analysis (dictionary, memory, hinted prompt) carry just that line.
+TRANSLATION_LABEL = "**Translation:** "
 
 
 class Translate(BaseModel):
@@ -24,6 +45,7 @@ class Command(BaseCommand):
 
     content: str
     target_language: str = "pt"
+    deep: bool = False
 
 
 class CommandResponse(BaseFrozen, ToJSON):
@@ -34,40 +56,137 @@ class CommandResponse(BaseFrozen, ToJSON):
     target_language: str
 
 
+def extract_translation(text: str) -> Optional[str]:
+    """Return the translation line of a full prompt_translate answer, if present."""
+    found = TRANSLATION_LINE.search(text)
+    return found.group(1) if found else None
+
+
 class Handler(BaseCommandHandler[Command]):
     """Handler for translation command execution."""
 
+    def __init__(self, render: bool = True, stream: bool = False):
+        """
+        Args:
+            render: Show the spinner and print the translation to the console
+            stream: Render the translation incrementally while it is generated
+        """
+        self.render = render
+        self.stream = stream and render
+
     async def handle_command(self, command: Command) -> tuple[Dict[str, Any], int]:
         """Execute translation using google-genai and return formatted response."""
 
+        # The connection is opened while the local lookups run; it is unused when one of them answers.
         api_key = os.getenv("GOOGLE_API_KEY")
+        if api_key:
+            prewarm(api_key)
+
+        # Short terms found in the offline dictionary are answered without the model.
+        if not command.deep and is_short_term(command.content):
+            dictionary = open_dictionary(command.target_language)
+            entry = dictionary.lookup(command.content) if dictionary else None
+            if entry is not None:
+                return self._respond(command, TRANSLATION_LABEL + entry)
+
+        cache = translation_cache()
+        cache_key = translation_key(command.content, command.target_language, MODEL, PROMPT_TRANSLATE_VERSION)
+        cached = cache.get(cache_key) if cache else None
+        if cached is not None:
+            return self._respond(command, cached)
+
+        memory = translation_memory()
+        remembered = memory.exact(command.content, command.target_language) if memory else None
+        if remembered is not None:
+            return self._respond(command, TRANSLATION_LABEL + remembered)
+
         if not api_key:
             raise BadRequest(
                 message="GOOGLE_API_KEY not found in environment. Set it in .env file"
             )
 
-        translation_prompt = prompt_translate(command.content, command.target_language)
-
-        with spinner("Translating…", spinner_style="dots"):
-            response = await genai.Client(api_key=api_key).aio.models.generate_content(
-                model="models/gemini-flash-latest", contents=translation_prompt
+        # A similar remembered segment replaces the full analysis with a short hinted prompt.
+        match = memory.fuzzy(command.content, command.target_language, fuzzy_threshold()) if memory else None
+        if match:
+            system_instruction = SYSTEM_TRANSLATE_WITH_HINT
+            translation_prompt = prompt_translate_with_hint(
+                command.content, command.target_language, match.source, match.translation
             )
+            label = TRANSLATION_LABEL
+        else:
+            system_instruction = SYSTEM_TRANSLATE
+            translation_prompt = prompt_translate(command.content, command.target_language)
+            label = ""
+
+        await warmed(api_key)
+        if self.stream:
+            text = await self._generate_streaming(api_key, system_instruction, translation_prompt, label)
+        else:
+            text = await self._generate(api_key, system_instruction, translation_prompt, label)
+
+        translation = text[len(label):].strip() if match else extract_translation(text)
+        if memory and translation:
+            memory.add(command.content, command.target_language, translation)
+        if cache and not match:
+            cache.put(cache_key, text)
 
-        if not response.text:
-            raise BadRequest(message="Empty response from translation service")
-
-        Format.markdown(response.text)
+        return json_response(
+            CommandResponse(
+                translated_content=text,
+                original_content=command.content,
+                target_language=command.target_language,
+            )
+        )
 
+    def _respond(self, command: Command, text: str) -> tuple[Dict[str, Any], int]:
+        """Render a locally available translation and build the response."""
+        if self.render:
+            Format.markdown(text)
         return json_response(
             CommandResponse(
-                translated_content=response.text,
+                translated_content=text,
                 original_content=command.content,
                 target_language=command.target_language,
             )
         )
 
+    async def _generate(self, api_key: str, system_instruction: str, prompt: str, label: str = "") -> str:
+        with spinner("Translating…", spinner_style="dots") if self.render else nullcontext(), metrics.timed("translate.request_ms"):
+            response = await generate_content(api_key, MODEL, system_instruction, prompt)
+        record_usage("translate", response)
+
+        if not response.text or not response.text.strip():
+            raise BadRequest(message="Empty response from translation service")
+
+        text = label + response.text.strip() if label else response.text
+        if self.render:
+            Format.markdown(text)
+        return text
+
+    async def _generate_streaming(self, api_key: str, system_instruction: str, prompt: str, label: str = "") -> str:
+        stream = generate_content_stream(api_key, MODEL, system_instruction, prompt)
+
+        async def texts() -> AsyncIterator[str]:
+            # Usage metadata is complete on the last chunk of the stream.
+            last = None
+            if label:
+                yield label
+            async for chunk in stream:
+                last = chunk
+                if chunk.text:
+                    yield chunk.text
+            record_usage("translate", last)
 
-async def execute_translate(content: Optional[str]) -> int:
+        text = await Format.markdown_stream(texts(), waiting_message="Translating…")
+
+        if not text[len(label):].strip():
+            raise BadRequest(message="Empty response from translation service")
+        return text
+
+
+async def execute_translate(
+    content: Optional[str], stream: bool = False, target_language: str = "pt", deep: bool = False
+) -> int:
     """
     Execute translation command with CLI validation.
 
@@ -75,6 +194,9 @@ async def execute_translate(content: Optional[str]) -> int:
 
     Args:
         content: The text content to translate
+        stream: Render the translation incrementally while it is generated
+        target_language: Language code to translate into
+        deep: Always ask the model, skipping the offline dictionary
 
     Returns:
         Exit code: 0 for success, 1 for failure
@@ -84,10 +206,14 @@ async def execute_translate(content: Optional[str]) -> int:
             print("Error: Translation content is required")
             return 1
 
-        request_data = {"content": content, "target_language": "pt"}
+        if not target_language:
+            print("Error: A target language code is required")
+            return 1
+
+        request_data = {"content": content, "target_language": target_language, "deep": deep}
 
         response, status_code = await execute_command_handler(
-            Command, request_data, Handler
+            Command, request_data, lambda: Handler(stream=stream)
         )
 
         return 0 if status_code == 200 else 1
@@ -0,0 +1,174 @@
+import asyncio
+import json
+import sys
+
+from contextlib import nullcontext
+from typing import Any, Dict, Iterator, Optional, Set, TextIO
+
+from common.base import BaseFrozen, ToJSON
+from common.command.base_command import BaseCommand
+from common.command.base_command_handler import BaseCommandHandler
+from common.command.execute_command_handler import BadRequest, json_response, execute_command_handler
+from common.json import write_jsonl
+from domains.translate.command import translate
+
+STDIN = "-"
+
+
+class Command(BaseCommand):
+    """Batch translation command input."""
+
+    source: str
+    concurrency: int = 8
+    target_language: str = "pt"
+
+
+class CommandResponse(BaseFrozen, ToJSON):
+    """Batch translation command output."""
+
+    total: int
+    succeeded: int
+    failed: int
+
+
+def parse_line(line: str, target_language: str = "pt") -> Dict[str, Any]:
+    """
+    Turn an input line into translate command request data.
+
+    Lines holding a JSON object are used as-is (e.g. {"content": "...", "target_language": "es"});
+    any other line is the text to translate. Entries naming no language get `target_language`.
+    """
+    stripped = line.strip()
+    if stripped.startswith("{"):
+        try:
+            data = json.loads(stripped)
+            if isinstance(data, dict):
+                return {"target_language": target_language, **data}
+        except ValueError:
+            pass
+    return {"content": stripped, "target_language": target_language}
+
+
+def read_requests(stream: TextIO, target_language: str = "pt") -> Iterator[Dict[str, Any]]:
+    """Yield request data for every non-blank line of the input."""
+    for line in stream:
+        if line.strip():
+            yield parse_line(line, target_language)
+
+
+class Handler(BaseCommandHandler[Command]):
+    """Handler translating many inputs concurrently, emitting results in input order."""
+
+    def __init__(self, output: TextIO = sys.stdout):
+        """
+        Args:
+            output: Stream receiving one JSON result per line
+        """
+        self.output = output
+
+    async def handle_command(self, command: Command) -> tuple[Dict[str, Any], int]:
+        """Translate every input line with translate.Handler under a concurrency limit."""
+
+        if command.concurrency < 1:
+            raise BadRequest(message="Concurrency must be at least 1")
+
+        if not command.target_language.strip() or "," in command.target_language:
+            raise BadRequest(message="Batch translation takes exactly one default target language")
+
+        try:
+            stream = sys.stdin if command.source == STDIN else open(command.source, encoding="utf-8")
+        except OSError as e:
+            raise BadRequest(message=f"Cannot read batch input: {e}")
+
+        # stdin belongs to the caller and stays open.
+        with stream if stream is not sys.stdin else nullcontext(stream):
+            return await self._translate_all(read_requests(stream, command.target_language.strip()), command.concurrency)
+
+    async def _translate_all(self, requests: Iterator[Dict[str, Any]], concurrency: int) -> tuple[Dict[str, Any], int]:
+        semaphore = asyncio.Semaphore(concurrency)
+        completed: Dict[int, Dict[str, Any]] = {}
+        tasks: Set[asyncio.Task] = set()
+        next_to_emit = 0
+        total = succeeded = 0
+
+        async def translate_one(index: int, request_data: Dict[str, Any]) -> None:
+            try:
+                response, status = await execute_command_handler(
+                    translate.Command, request_data, lambda: translate.Handler(render=False)
+                )
+                # Failed entries echo their input, since there is no CommandResponse to carry it.
+                fields = response if status == 200 else {**request_data, **response}
+                completed[index] = {"index": index, "status": status, **fields}
+            finally:
+                semaphore.release()
+
+        def ready() -> Iterator[Dict[str, Any]]:
+            nonlocal next_to_emit, succeeded
+            while next_to_emit in completed:
+                result = completed.pop(next_to_emit)
+                succeeded += result["status"] == 200
+                next_to_emit += 1
+                yield result
+
+        def emit_ready() -> None:
+            # Results are released as they are written; only those waiting for an earlier one are held.
+            write_jsonl(ready(), self.output)
+            self.output.flush()
+
+        def on_done(task: asyncio.Task) -> None:
+            tasks.discard(task)
+            emit_ready()
+
+        # Requests are read lazily: a new one starts only once a slot is free.
+        while True:
+            await semaphore.acquire()
+            request_data = await asyncio.to_thread(next, requests, None)
+            if request_data is None:
+                semaphore.release()
+                break
+
+            task = asyncio.create_task(translate_one(total, request_data))
+            tasks.add(task)
+            task.add_done_callback(on_done)
+            total += 1
+
+        if tasks:
+            await asyncio.gather(*tasks)
+        emit_ready()
+
+        return json_response(CommandResponse(total=total, succeeded=succeeded, failed=total - succeeded))
+
+
+async def execute_translate_batch(source: Optional[str], concurrency: int = 8, target_language: str = "pt") -> int:
+    """
+    Execute batch translation command with CLI validation.
+
+    Validates input, constructs command, and executes handler.
+
+    Args:
+        source: Path of the input file, or "-" to read from stdin
+        concurrency: Maximum number of translations running at once
+        target_language: Language of the entries that do not name one
+
+    Returns:
+        Exit code: 0 when every entry was translated, 1 otherwise
+    """
+    try:
+        if not source:
+            print("Error: Batch input file is required")
+            return 1
+
+        request_data = {"source": source, "concurrency": concurrency, "target_language": target_language}
+
+        response, status_code = await execute_command_handler(Command, request_data, Handler)
+
+        if status_code != 200:
+            print(f"Error: {response['error']['message']}", file=sys.stderr)
+            return 1
+
+        print(f"Translated {response['succeeded']}/{response['total']} entries", file=sys.stderr)
+        return 0 if response["failed"] == 0 else 1
+
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        return 1
@@ -0,0 +1,194 @@
+import asyncio
+import os
+import sys
+import time
+
+from typing import Any, Dict, List, Optional
+
+from common.base import BaseFrozen, ToJSON
+from common.command.base_command import BaseCommand
+from common.command.base_command_handler import BaseCommandHandler
+from common.command.execute_command_handler import BadRequest, json_response, execute_command_handler, retrying_on_failure
+from common.console import get_console
+from common.context_cache import generate_content
+from common.genai_client import record_usage
+from common.prompts import PROMPT_TRANSLATE_CHUNK_VERSION, SYSTEM_TRANSLATE_CHUNK, prompt_translate_chunk
+from domains.translate.cache import translation_cache, translation_key
+from domains.translate.chunking import Chunk, chunk_document, estimate_tokens
+from domains.translate.command.translate import MODEL
+
+STDIN = "-"
+
+
+class Command(BaseCommand):
+    """Document translation command input."""
+
+    source: str
+    target_language: str = "pt"
+    concurrency: int = 8
+    chunk_tokens: int = 800
+    max_retries: int = 3
+
+
+class ChunkReport(BaseFrozen, ToJSON):
+    """Outcome and timing of one translated chunk."""
+
+    index: int
+    tokens: int
+    attempts: int
+    seconds: float
+    cached: bool
+    error: Optional[str] = None
+
+
+class CommandResponse(BaseFrozen, ToJSON):
+    """Document translation command output."""
+
+    translated_content: str
+    target_language: str
+    chunks: List[ChunkReport]
+
+
+class Handler(BaseCommandHandler[Command]):
+    """Handler translating a long document in concurrent, order-preserving chunks."""
+
+    async def handle_command(self, command: Command) -> tuple[Dict[str, Any], int]:
+        """Split the document, translate chunks concurrently and reassemble them in order."""
+
+        if command.concurrency < 1 or command.chunk_tokens < 1:
+            raise BadRequest(message="Concurrency and chunk tokens must be at least 1")
+
+        if not command.target_language.strip() or "," in command.target_language:
+            raise BadRequest(message="Translate a document into exactly one target language")
+
+        api_key = os.getenv("GOOGLE_API_KEY")
+        if not api_key:
+            raise BadRequest(message="GOOGLE_API_KEY not found in environment. Set it in .env file")
+
+        try:
+            if command.source == STDIN:
+                document = sys.stdin.read()
+            else:
+                with open(command.source, encoding="utf-8") as file:
+                    document = file.read()
+        except OSError as e:
+            raise BadRequest(message=f"Cannot read document: {e}")
+
+        chunks = chunk_document(document, command.chunk_tokens)
+        semaphore = asyncio.Semaphore(command.concurrency)
+        done = 0
+
+        with get_console().status(f"Translating 0/{len(chunks)} chunks…", spinner="dots") as status:
+            async def translate_tracked(chunk: Chunk) -> tuple[str, ChunkReport]:
+                nonlocal done
+                result = await self._translate_chunk(api_key, chunk, command, semaphore)
+                done += 1
+                status.update(f"Translating {done}/{len(chunks)} chunks…")
+                return result
+
+            results = await asyncio.gather(*(translate_tracked(chunk) for chunk in chunks))
+
+        translated = "".join(text + chunk.separator for chunk, (text, _) in zip(chunks, results))
+        reports = [report for _, report in results]
+
+        return json_response(
+            CommandResponse(
+                translated_content=translated,
+                target_language=command.target_language,
+                chunks=reports,
+            )
+        )
+
+    async def _translate_chunk(
+        self, api_key: str, chunk: Chunk, command: Command, semaphore: asyncio.Semaphore
+    ) -> tuple[str, ChunkReport]:
+        tokens = estimate_tokens(chunk.text)
+        cache = translation_cache()
+        cache_key = translation_key(
+            f"{chunk.context}\n{chunk.text}", command.target_language, MODEL, PROMPT_TRANSLATE_CHUNK_VERSION
+        )
+        cached = cache.get(cache_key) if cache else None
+        if cached is not None:
+            return cached, ChunkReport(index=chunk.index, tokens=tokens, attempts=0, seconds=0.0, cached=True)
+
+        prompt = prompt_translate_chunk(chunk.text, chunk.context, command.target_language)
+        attempts = 0
+
+        async def attempt() -> str:
+            nonlocal attempts
+            attempts += 1
+            response = await generate_content(api_key, MODEL, SYSTEM_TRANSLATE_CHUNK, prompt)
+            record_usage("translate_document", response)
+            if not response.text or not response.text.strip():
+                raise BadRequest(message="Empty response from translation service")
+            return response.text.strip()
+
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                text = await retrying_on_failure(command.max_retries, attempt, backoff_seconds=1.0)
+                error = None
+            except RuntimeError as e:
+                # Keep the source text so the document stays complete and in order.
+                text, error = chunk.text, str(e)
+            seconds = round(time.perf_counter() - started, 3)
+
+        if error is None and cache:
+            cache.put(cache_key, text)
+
+        return text, ChunkReport(
+            index=chunk.index, tokens=tokens, attempts=attempts, seconds=seconds, cached=False, error=error
+        )
+
+
+async def execute_translate_document(
+    source: Optional[str], concurrency: int = 8, chunk_tokens: int = 800, target_language: str = "pt"
+) -> int:
+    """
+    Execute document translation command with CLI validation.
+
+    Validates input, constructs command, and executes handler. The translated
+    document is written to stdout and the per-chunk report to stderr.
+
+    Args:
+        source: Path of the document, or "-" to read from stdin
+        concurrency: Maximum number of chunks translated at once
+        chunk_tokens: Estimated token budget of each chunk
+        target_language: Language code the document is translated into
+
+    Returns:
+        Exit code: 0 when every chunk was translated, 1 otherwise
+    """
+    try:
+        if not source:
+            print("Error: Document file is required")
+            return 1
+
+        request_data = {
+            "source": source,
+            "concurrency": concurrency,
+            "chunk_tokens": chunk_tokens,
+            "target_language": target_language,
+        }
+
+        response, status_code = await execute_command_handler(Command, request_data, Handler)
+
+        if status_code != 200:
+            print(f"Error: {response['error']['message']}", file=sys.stderr)
+            return 1
+
+        sys.stdout.write(response["translated_content"])
+
+        failed = 0
+        for report in response["chunks"]:
+            outcome = "cached" if report["cached"] else f"{report['attempts']} attempt(s), {report['seconds']:.2f}s"
+            if report["error"]:
+                failed += 1
+                outcome += f", kept source text: {report['error']}"
+            print(f"chunk {report['index']}: ~{report['tokens']} tokens, {outcome}", file=sys.stderr)
+
+        return 0 if failed == 0 else 1
+
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        return 1
@@ -0,0 +1,119 @@
+import asyncio
+
+from contextlib import nullcontext
+from typing import Any, Dict, List, Optional
+
+from common.base import BaseFrozen, ToJSON
+from common.command.base_command import BaseCommand
+from common.command.base_command_handler import BaseCommandHandler
+from common.command.execute_command_handler import BadRequest, json_response, execute_command_handler
+from common.format_markdown import Format
+from common.loading import spinner
+from domains.translate.command import translate
+
+
+class Command(BaseCommand):
+    """Multi-language translation command input."""
+
+    content: str
+    target_languages: List[str]
+    concurrency: int = 8
+    deep: bool = False
+
+
+class CommandResponse(BaseFrozen, ToJSON):
+    """Multi-language translation command output, keyed by target language."""
+
+    original_content: str
+    translations: Dict[str, str]
+    errors: Dict[str, str]
+
+
+class Handler(BaseCommandHandler[Command]):
+    """Handler translating one input into several languages concurrently."""
+
+    def __init__(self, render: bool = True):
+        """
+        Args:
+            render: Print every translation to the console once all are done
+        """
+        self.render = render
+
+    async def handle_command(self, command: Command) -> tuple[Dict[str, Any], int]:
+        """Fan out one translate.Handler request per target language and collect the results."""
+
+        languages = list(dict.fromkeys(language.strip().lower() for language in command.target_languages if language.strip()))
+        if not languages:
+            raise BadRequest(message="At least one target language is required")
+        if command.concurrency < 1:
+            raise BadRequest(message="Concurrency must be at least 1")
+
+        # Each target goes through translate.Handler, so cached or remembered
+        # languages are served locally and only the rest reach the model.
+        semaphore = asyncio.Semaphore(command.concurrency)
+
+        async def translate_one(language: str) -> tuple[Dict[str, Any], int]:
+            async with semaphore:
+                return await execute_command_handler(
+                    translate.Command,
+                    {"content": command.content, "target_language": language, "deep": command.deep},
+                    lambda: translate.Handler(render=False),
+                )
+
+        with spinner(f"Translating into {len(languages)} languages…", spinner_style="dots") if self.render else nullcontext():
+            results = await asyncio.gather(*(translate_one(language) for language in languages))
+
+        translations: Dict[str, str] = {}
+        errors: Dict[str, str] = {}
+        for language, (response, status) in zip(languages, results):
+            if status == 200:
+                translations[language] = response["translated_content"]
+            else:
+                errors[language] = response["error"]["message"]
+
+        if self.render:
+            for language, text in translations.items():
+                Format.markdown(f"## {language}\n\n{text}")
+
+        return json_response(
+            CommandResponse(original_content=command.content, translations=translations, errors=errors)
+        )
+
+
+async def execute_translate_multi(
+    content: Optional[str], languages: List[str], concurrency: int = 8, deep: bool = False
+) -> int:
+    """
+    Execute multi-language translation command with CLI validation.
+
+    Validates input, constructs command, and executes handler.
+
+    Args:
+        content: The text content to translate
+        languages: Target language codes
+        concurrency: Maximum number of translations running at once
+        deep: Always ask the model, skipping the offline dictionary
+
+    Returns:
+        Exit code: 0 when every language was translated, 1 otherwise
+    """
+    try:
+        if not content:
+            print("Error: Translation content is required")
+            return 1
+
+        request_data = {"content": content, "target_languages": languages, "concurrency": concurrency, "deep": deep}
+
+        response, status_code = await execute_command_handler(Command, request_data, Handler)
+
+        if status_code != 200:
+            print(f"Error: {response['error']['message']}")
+            return 1
+
+        for language, message in response["errors"].items():
+            print(f"Error ({language}): {message}")
+        return 0 if not response["errors"] else 1
+
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        return 1
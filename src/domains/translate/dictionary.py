@@ -0,0 +1,206 @@
+"""
+Offline bilingual dictionary for single words and short phrases.
+
+A dictionary is a compact binary file per target language, memory-mapped and
+searched with a binary search, so a lookup touches a handful of pages and costs
+microseconds without any network access. Files are built from word lists with
+`quick --import-dictionary FILE -l CODE`.
+
+File layout (little-endian):
+    magic       8 bytes, b"QKDICT1\\0"
+    count       uint32, number of entries
+    offsets     (count + 1) x uint32, start of each entry within the data area
+    data        entries sorted by key bytes, each b"<key>\\0<translation>"
+
+Keys are normalized terms (see `normalize_term`); a key with several
+translations stores them joined with " / ", the alternatives format of the
+translation prompt.
+"""
+
+import mmap
+import os
+import struct
+import sys
+
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional, TextIO, Tuple
+
+from common.paths import cache_dir
+from domains.translate.cache import normalize_content
+
+MAGIC = b"QKDICT1\0"
+HEADER = struct.Struct("<8sI")
+OFFSET = struct.Struct("<I")
+
+# Inputs longer than this many words always go to the model.
+MAX_TERM_WORDS = 3
+
+
+def normalize_term(term: str) -> str:
+    """Return the dictionary key of a term: normalized whitespace, case-folded."""
+    return normalize_content(term).casefold()
+
+
+def is_short_term(text: str) -> bool:
+    """Return whether a text is short enough to be looked up in the dictionary."""
+    words = text.split()
+    return 0 < len(words) <= MAX_TERM_WORDS and "\0" not in text
+
+
+def read_word_list(stream: TextIO) -> Iterator[Tuple[str, str]]:
+    """
+    Yield (term, translation) pairs from a tab-separated word list.
+
+    Each line holds a term and its translation separated by a tab; blank lines,
+    lines starting with "#" and lines without a translation are skipped.
+    """
+    for line in stream:
+        if not line.strip() or line.startswith("#"):
+            continue
+        term, _, translation = line.rstrip("\n").partition("\t")
+        if term.strip() and translation.strip():
+            yield term, translation.strip()
+
+
+def build_dictionary(entries: Iterable[Tuple[str, str]], path: Path) -> int:
+    """
+    Write a dictionary file from (term, translation) pairs.
+
+    Later translations of a term are added as alternatives unless already
+    present. The file is replaced atomically, so processes that have the old
+    file mapped keep reading it safely.
+
+    Args:
+        entries: Pairs of term and translation
+        path: Destination file
+
+    Returns:
+        Number of distinct terms written
+    """
+    merged: Dict[bytes, list[str]] = {}
+    for term, translation in entries:
+        key = normalize_term(term).encode("utf-8")
+        if not key:
+            continue
+        alternatives = merged.setdefault(key, [])
+        for alternative in translation.split(" / "):
+            alternative = alternative.strip().replace("\0", "")
+            if alternative and alternative not in alternatives:
+                alternatives.append(alternative)
+
+    records = [key + b"\0" + " / ".join(values).encode("utf-8") for key, values in sorted(merged.items())]
+    offsets = [0]
+    for record in records:
+        offsets.append(offsets[-1] + len(record))
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(temporary, "wb") as file:
+        file.write(HEADER.pack(MAGIC, len(records)))
+        file.write(struct.pack(f"<{len(offsets)}I", *offsets))
+        file.writelines(records)
+    os.replace(temporary, path)
+    return len(records)
+
+
+class Dictionary:
+    """
+    Read-only view of a memory-mapped dictionary file.
+
+    Args:
+        path: Dictionary file written by build_dictionary
+
+    Raises:
+        ValueError: The file is not a dictionary, or is truncated
+    """
+
+    def __init__(self, path: Path):
+        with open(path, "rb") as file:
+            size = os.fstat(file.fileno()).st_size
+            if size < HEADER.size:
+                raise ValueError(f"{path} is too short to be a dictionary file")
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self._count = HEADER.unpack_from(self._map, 0)
+        self._offsets = HEADER.size
+        self._data = self._offsets + (self._count + 1) * OFFSET.size
+        if magic != MAGIC:
+            self._map.close()
+            raise ValueError(f"{path} is not a dictionary file")
+        # The last offset is the length of the data area, which must end the file.
+        if self._data > size or self._data + OFFSET.unpack_from(self._map, self._data - OFFSET.size)[0] != size:
+            self._map.close()
+            raise ValueError(f"{path} is truncated or corrupt")
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _record(self, index: int) -> bytes:
+        start, end = struct.unpack_from("<II", self._map, self._offsets + index * OFFSET.size)
+        return self._map[self._data + start:self._data + end]
+
+    def lookup(self, term: str) -> Optional[str]:
+        """Return the translation of a term, or None when it is not in the dictionary."""
+        key = normalize_term(term).encode("utf-8")
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            record = self._record(middle)
+            found, _, translation = record.partition(b"\0")
+            if found == key:
+                return translation.decode("utf-8")
+            if found < key:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+    def items(self) -> Iterator[Tuple[str, str]]:
+        """Yield every (term, translation) pair in key order."""
+        for index in range(self._count):
+            key, _, translation = self._record(index).partition(b"\0")
+            yield key.decode("utf-8"), translation.decode("utf-8")
+
+    def close(self) -> None:
+        """Unmap the dictionary file."""
+        self._map.close()
+
+
+def dictionary_path(target_language: str) -> Path:
+    """Return the dictionary file of a target language."""
+    return cache_dir() / "dictionaries" / f"{target_language.lower()}.qkdict"
+
+
+# Unreadable files are remembered as None, so they are reported once per version.
+_dictionaries: Dict[str, Tuple[int, Optional[Dictionary]]] = {}
+
+def open_dictionary(target_language: str) -> Optional[Dictionary]:
+    """
+    Return the dictionary of a target language, mapping it on first use.
+
+    The mapping is kept for the life of the process and replaced when the file
+    changes, e.g. after an import while the daemon is running.
+
+    Returns:
+        The dictionary, or None when none has been imported for the language or
+        its file is corrupt; translations then fall through to the model
+    """
+    path = dictionary_path(target_language)
+    try:
+        modified = path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+    opened = _dictionaries.get(target_language.lower())
+    if opened is not None and opened[0] == modified:
+        return opened[1]
+
+    dictionary: Optional[Dictionary]
+    try:
+        dictionary = Dictionary(path)
+    except (OSError, ValueError) as error:
+        print(f"Ignoring dictionary: {error}", file=sys.stderr)
+        dictionary = None
+    if opened is not None and opened[1] is not None:
+        opened[1].close()
+    _dictionaries[target_language.lower()] = (modified, dictionary)
+    return dictionary
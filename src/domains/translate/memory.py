@@ -0,0 +1,204 @@
+"""
+Local translation memory of previously translated segments.
+
+Segment pairs are stored in SQLite together with a character n-gram inverted index
+of their source text. Exact lookups go through a unique index on the normalized
+source. Fuzzy lookups use prefix filtering: only the query's rarest n-grams are
+looked up in the inverted index, which is enough to find every segment that can
+reach the requested Dice similarity, and candidates are then scored exactly.
+
+Configuration (environment variables):
+    QUICK_TRANSLATION_MEMORY        Set to "0" to disable the translation memory
+    QUICK_TM_FUZZY_THRESHOLD        Minimum similarity of a fuzzy match (default: 0.75)
+"""
+
+import math
+import os
+import sqlite3
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Collection, Iterable, Optional, Set, Tuple
+
+from common.paths import cache_dir
+from domains.translate.cache import normalize_content
+
+NGRAM_SIZE = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS segments (
+    id INTEGER PRIMARY KEY,
+    target TEXT NOT NULL,
+    normalized TEXT NOT NULL,
+    source TEXT NOT NULL,
+    translation TEXT NOT NULL,
+    gram_count INTEGER NOT NULL,
+    UNIQUE (target, normalized)
+);
+CREATE TABLE IF NOT EXISTS gram_frequencies (
+    target TEXT NOT NULL,
+    gram TEXT NOT NULL,
+    frequency INTEGER NOT NULL,
+    PRIMARY KEY (target, gram)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS grams (
+    target TEXT NOT NULL,
+    gram TEXT NOT NULL,
+    segment_id INTEGER NOT NULL,
+    PRIMARY KEY (target, gram, segment_id)
+) WITHOUT ROWID;
+"""
+
+
+@dataclass(frozen=True)
+class MemoryMatch:
+    """A stored segment pair and its similarity to the looked up text."""
+    source: str
+    translation: str
+    similarity: float
+
+
+def ngrams(normalized: str, size: int = NGRAM_SIZE) -> Set[str]:
+    """Return the set of character n-grams of a normalized text, padded at both ends."""
+    padded = f" {normalized.lower()} "
+    return {padded[i:i + size] for i in range(max(1, len(padded) - size + 1))}
+
+
+class TranslationMemory:
+    """
+    Store of (source, translation) segment pairs per target language.
+
+    Args:
+        path: Database file, created if missing
+    """
+
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(path, timeout=5.0)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+
+    def exact(self, source: str, target_language: str) -> Optional[str]:
+        """Return the stored translation of a segment, ignoring whitespace differences."""
+        row = self._db.execute(
+            "SELECT translation FROM segments WHERE target = ? AND normalized = ?",
+            (target_language.lower(), normalize_content(source)),
+        ).fetchone()
+        return row[0] if row else None
+
+    def fuzzy(self, source: str, target_language: str, threshold: float) -> Optional[MemoryMatch]:
+        """
+        Find the stored segment most similar to a text.
+
+        Args:
+            source: Text to look up
+            target_language: Target language code of the stored translation
+            threshold: Minimum Dice similarity of the n-gram sets, between 0 and 1
+
+        Returns:
+            The best match at or above the threshold, or None
+        """
+        target = target_language.lower()
+        query = ngrams(normalize_content(source))
+        if not query or not 0 < threshold <= 1:
+            return None
+
+        # Dice >= t is only reachable when the candidate's n-gram count lies in this
+        # range, and then requires sharing at least `min_shared` n-grams with the query.
+        min_count = len(query) * threshold / (2 - threshold)
+        max_count = len(query) * (2 - threshold) / threshold
+        min_shared = math.ceil(threshold * (len(query) + min_count) / 2)
+
+        # Prefix filter: a segment sharing `min_shared` n-grams must contain one of
+        # the `len(query) - min_shared + 1` rarest ones, so only those are looked up.
+        frequencies = dict(self._db.execute(
+            f"SELECT gram, frequency FROM gram_frequencies WHERE target = ? AND gram IN ({_placeholders(query)})",
+            (target, *query),
+        ).fetchall())
+        rarest = sorted(query, key=lambda gram: frequencies.get(gram, 0))[:len(query) - min_shared + 1]
+        probes = [gram for gram in rarest if gram in frequencies]
+        if not probes:
+            return None
+
+        rows = self._db.execute(
+            f"""
+            SELECT source, normalized, translation FROM segments
+            WHERE gram_count BETWEEN ? AND ? AND id IN (
+                SELECT segment_id FROM grams WHERE target = ? AND gram IN ({_placeholders(probes)})
+            )
+            """,
+            (min_count, max_count, target, *probes),
+        ).fetchall()
+
+        best: Optional[MemoryMatch] = None
+        for stored_source, normalized, translation in rows:
+            grams = ngrams(normalized)
+            similarity = 2 * len(query & grams) / (len(query) + len(grams))
+            if similarity >= threshold and (best is None or similarity > best.similarity):
+                best = MemoryMatch(source=stored_source, translation=translation, similarity=similarity)
+        return best
+
+    def add(self, source: str, target_language: str, translation: str) -> None:
+        """Store or replace the translation of a segment and index its n-grams."""
+        self.add_many([(source, target_language, translation)])
+
+    def add_many(self, pairs: Iterable[Tuple[str, str, str]]) -> None:
+        """
+        Store or replace many (source, target language, translation) triples in one transaction.
+
+        Use for bulk imports; committing each segment separately is far slower.
+        """
+        with self._db:
+            for source, target_language, translation in pairs:
+                target = target_language.lower()
+                normalized = normalize_content(source)
+                updated = self._db.execute(
+                    "UPDATE segments SET translation = ? WHERE target = ? AND normalized = ?",
+                    (translation, target, normalized),
+                )
+                if updated.rowcount:
+                    continue
+
+                grams = ngrams(normalized)
+                cursor = self._db.execute(
+                    "INSERT INTO segments (target, normalized, source, translation, gram_count) VALUES (?, ?, ?, ?, ?)",
+                    (target, normalized, source, translation, len(grams)),
+                )
+                self._db.executemany(
+                    "INSERT INTO grams (target, gram, segment_id) VALUES (?, ?, ?)",
+                    [(target, gram, cursor.lastrowid) for gram in grams],
+                )
+                self._db.executemany(
+                    """
+                    INSERT INTO gram_frequencies (target, gram, frequency) VALUES (?, ?, 1)
+                    ON CONFLICT (target, gram) DO UPDATE SET frequency = frequency + 1
+                    """,
+                    [(target, gram) for gram in grams],
+                )
+
+
+def _placeholders(values: Collection[str]) -> str:
+    return ",".join("?" * len(values))
+
+
+_memory: TranslationMemory | None = None
+
+def translation_memory() -> Optional[TranslationMemory]:
+    """
+    Return the process-wide translation memory, opening it on first use.
+
+    Returns:
+        The shared memory, or None when disabled with QUICK_TRANSLATION_MEMORY=0
+    """
+    global _memory
+    if os.getenv("QUICK_TRANSLATION_MEMORY", "1") == "0":
+        return None
+    if _memory is None:
+        _memory = TranslationMemory(cache_dir() / "translation_memory.sqlite3")
+    return _memory
+
+
+def fuzzy_threshold() -> float:
+    """Return the configured minimum similarity of fuzzy matches."""
+    return float(os.getenv("QUICK_TM_FUZZY_THRESHOLD", "0.75"))